@@ -14,7 +14,8 @@ from fastapi.responses import JSONResponse, PlainTextResponse
 
 from models import GeneratedFilesResponse, LLMConfigRequest
 from workflow_state import get_state_manager
-from template_renderer import SpecRenderer
+from workflow import get_workflow_manager
+from template_renderer import get_spec_renderer
 from config import settings
 
 logger = logging.getLogger(__name__)
@@ -37,7 +38,7 @@ async def get_generated_files(workflow_id: str) -> GeneratedFilesResponse:
     
     try:
         state_manager = get_state_manager()
-        workflow_state = state_manager.get_workflow_state(workflow_id)
+        workflow_state = await get_workflow_manager().get_workflow_state(workflow_id)
         
         if not workflow_state:
             raise HTTPException(
@@ -46,7 +47,7 @@ async def get_generated_files(workflow_id: str) -> GeneratedFilesResponse:
             )
         
         # Check if workflow has generated files
-        generated_files = workflow_state.get("generated_files", {})
+        generated_files = await state_manager.get_generated_files(workflow_id)
         
         if not generated_files:
             # Try to generate files from current content if workflow is complete enough
@@ -59,7 +60,7 @@ async def get_generated_files(workflow_id: str) -> GeneratedFilesResponse:
                 try:
                     # Convert to SpecState and render documents
                     spec_state = state_manager.convert_to_spec_state(workflow_state)
-                    renderer = SpecRenderer()
+                    renderer = get_spec_renderer()
                     
                     generated_files = {}
                     
@@ -129,7 +130,7 @@ async def get_phase_preview(
     
     try:
         state_manager = get_state_manager()
-        workflow_state = state_manager.get_workflow_state(workflow_id)
+        workflow_state = await get_workflow_manager().get_workflow_state(workflow_id)
         
         if not workflow_state:
             raise HTTPException(
@@ -151,7 +152,7 @@ async def get_phase_preview(
         
         if not phase_content:
             # Try to get from generated files
-            generated_files = workflow_state.get("generated_files", {})
+            generated_files = await state_manager.get_generated_files(workflow_id)
             file_name = f"{phase}.md"
             phase_content = generated_files.get(file_name)
             
@@ -204,7 +205,7 @@ async def download_file(workflow_id: str, filename: str) -> Response:
     
     try:
         state_manager = get_state_manager()
-        workflow_state = state_manager.get_workflow_state(workflow_id)
+        workflow_state = await get_workflow_manager().get_workflow_state(workflow_id)
         
         if not workflow_state:
             raise HTTPException(
@@ -213,7 +214,7 @@ async def download_file(workflow_id: str, filename: str) -> Response:
             )
         
         # Get generated files
-        generated_files = workflow_state.get("generated_files", {})
+        generated_files = await state_manager.get_generated_files(workflow_id)
         
         if filename not in generated_files:
             raise HTTPException(
@@ -324,7 +325,7 @@ async def export_workflow(workflow_id: str, format: str = "zip") -> Response:
     
     try:
         state_manager = get_state_manager()
-        workflow_state = state_manager.get_workflow_state(workflow_id)
+        workflow_state = await get_workflow_manager().get_workflow_state(workflow_id)
         
         if not workflow_state:
             raise HTTPException(
@@ -332,7 +333,7 @@ async def export_workflow(workflow_id: str, format: str = "zip") -> Response:
                 detail=f"Workflow {workflow_id} not found"
             )
         
-        generated_files = workflow_state.get("generated_files", {})
+        generated_files = await state_manager.get_generated_files(workflow_id)
         
         if not generated_files:
             raise HTTPException(
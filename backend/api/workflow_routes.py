@@ -3,16 +3,23 @@ Workflow management API endpoints for Spec-Bot.
 Handles workflow creation, status checking, approvals, and resets.
 """
 
+import json
 import logging
 from typing import Dict, Any, Optional
 from datetime import datetime
 import uuid
 
+try:
+    import orjson
+except ImportError:  # Optional, history streams fall back to the stdlib encoder
+    orjson = None
+
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from models import (
     StartWorkflowRequest, 
+    BatchStartWorkflowRequest,
     ApprovalRequest, 
     WorkflowStatusResponse,
     ErrorResponse,
@@ -20,8 +27,9 @@ from models import (
     ApprovalStatus,
     LLMProvider
 )
-from workflow_state import get_state_manager, WorkflowAction, WorkflowStatus
+from workflow_state import get_state_manager, WorkflowAction, WorkflowStatus, TERMINAL_STATUSES
 from workflow import get_workflow_manager
+from workflow_nodes import discard_speculative_draft
 from config import settings
 
 logger = logging.getLogger(__name__)
@@ -29,6 +37,16 @@ logger = logging.getLogger(__name__)
 # Create router for workflow endpoints
 router = APIRouter(prefix="/api/spec", tags=["workflow"])
 
+# Shared encoder for history streams when orjson isn't installed
+_NDJSON_ENCODER = json.JSONEncoder(default=str, separators=(",", ":"))
+
+
+def _encode_history_entry(entry: Dict[str, Any]) -> bytes:
+    """Encode one history entry as an NDJSON line, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(entry, default=str, option=orjson.OPT_APPEND_NEWLINE)
+    return (_NDJSON_ENCODER.encode(entry) + "\n").encode("utf-8")
+
 
 @router.post("/start")
 async def start_workflow(
@@ -53,17 +71,7 @@ async def start_workflow(
         logger.info(f"Starting workflow {workflow_id} for feature: {request.feature_name}")
         
         # Validate LLM provider configuration
-        api_keys = settings.validate_api_keys()
-        if request.llm_provider == LLMProvider.OPENAI and not api_keys["openai"]:
-            raise HTTPException(
-                status_code=400,
-                detail="OpenAI API key not configured"
-            )
-        elif request.llm_provider == LLMProvider.ANTHROPIC and not api_keys["anthropic"]:
-            raise HTTPException(
-                status_code=400,
-                detail="Anthropic API key not configured"
-            )
+        _validate_provider_configured(request.llm_provider)
         
         # Start workflow in background
         workflow_manager = get_workflow_manager()
@@ -106,6 +114,94 @@ async def start_workflow(
         )
 
 
+@router.post("/start/batch")
+async def start_workflows_batch(
+    request: BatchStartWorkflowRequest,
+    background_tasks: BackgroundTasks
+) -> Dict[str, Any]:
+    """
+    Start several specification generation workflows in one request.
+    
+    Args:
+        request: Batch of workflow start requests
+        background_tasks: FastAPI background tasks for async processing
+        
+    Returns:
+        Workflow IDs and initial status for each requested feature
+    """
+    
+    try:
+        # Validate every provider up front so the batch is all-or-nothing
+        for workflow_request in request.workflows:
+            _validate_provider_configured(workflow_request.llm_provider)
+        
+        workflow_requests = [
+            {
+                "workflow_id": str(uuid.uuid4()),
+                "feature_name": workflow_request.feature_name,
+                "description": workflow_request.description,
+                "llm_provider": workflow_request.llm_provider.value,
+                "model_name": workflow_request.model_name,
+                "research_enabled": workflow_request.enable_research
+            }
+            for workflow_request in request.workflows
+        ]
+        
+        logger.info(f"Starting batch of {len(workflow_requests)} workflows")
+        
+        workflow_manager = get_workflow_manager()
+        
+        async def run_batch():
+            """Background task to run the batch of workflows"""
+            results = await workflow_manager.start_workflows_batch(workflow_requests)
+            
+            for workflow_request, result in zip(workflow_requests, results):
+                if isinstance(result, BaseException):
+                    logger.error(f"Error in background workflow {workflow_request['workflow_id']}: {result}")
+        
+        # Add to background tasks
+        background_tasks.add_task(run_batch)
+        
+        created_at = datetime.utcnow().isoformat()
+        return {
+            "workflows": [
+                {
+                    "workflow_id": workflow_request["workflow_id"],
+                    "status": "initializing",
+                    "feature_name": workflow_request["feature_name"],
+                    "created_at": created_at
+                }
+                for workflow_request in workflow_requests
+            ],
+            "total_count": len(workflow_requests),
+            "message": "Workflows started successfully"
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error starting workflow batch: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to start workflows: {str(e)}"
+        )
+
+
+def _validate_provider_configured(llm_provider: LLMProvider) -> None:
+    """Raise a 400 error if the API key for the LLM provider is missing"""
+    api_keys = settings.validate_api_keys()
+    if llm_provider == LLMProvider.OPENAI and not api_keys["openai"]:
+        raise HTTPException(
+            status_code=400,
+            detail="OpenAI API key not configured"
+        )
+    elif llm_provider == LLMProvider.ANTHROPIC and not api_keys["anthropic"]:
+        raise HTTPException(
+            status_code=400,
+            detail="Anthropic API key not configured"
+        )
+
+
 @router.get("/status")
 async def get_current_workflow_status() -> Dict[str, Any]:
     """
@@ -176,7 +272,7 @@ async def get_workflow_status(workflow_id: str) -> WorkflowStatusResponse:
     
     try:
         state_manager = get_state_manager()
-        workflow_state = state_manager.get_workflow_state(workflow_id)
+        workflow_state = await get_workflow_manager().get_workflow_state(workflow_id)
         
         if not workflow_state:
             raise HTTPException(
@@ -207,6 +303,11 @@ async def get_workflow_status(workflow_id: str) -> WorkflowStatusResponse:
                 else ApprovalStatus.PENDING
             )
         
+        # While the phase is being generated, show what the LLM has written so far
+        streaming_content = state_manager.get_streaming_content(workflow_id, workflow_state["current_phase"])
+        if streaming_content is not None:
+            current_phase_content = streaming_content
+        
         # Get recent messages (last 5)
         recent_messages = workflow_state["conversation_history"][-5:] if workflow_state["conversation_history"] else []
         
@@ -226,11 +327,7 @@ async def get_workflow_status(workflow_id: str) -> WorkflowStatusResponse:
             workflow_id=workflow_id,
             feature_name=workflow_state["feature_name"],
             current_phase=workflow_state["current_phase"],
-            is_active=workflow_state["status"] not in [
-                WorkflowStatus.COMPLETED, 
-                WorkflowStatus.FAILED, 
-                WorkflowStatus.CANCELLED
-            ],
+            is_active=workflow_state["status"] not in TERMINAL_STATUSES,
             created_at=datetime.fromisoformat(workflow_state["created_at"]),
             updated_at=datetime.fromisoformat(workflow_state["updated_at"]),
             requirements_completed=bool(workflow_state["requirements_content"]),
@@ -253,6 +350,40 @@ async def get_workflow_status(workflow_id: str) -> WorkflowStatusResponse:
         )
 
 
+@router.get("/history/{workflow_id}")
+async def get_workflow_history(workflow_id: str, limit: int = 20) -> StreamingResponse:
+    """
+    Stream the execution history of a workflow as newline-delimited JSON.
+    
+    Args:
+        workflow_id: Unique workflow identifier
+        limit: Maximum number of history entries to return (most recent first)
+        
+    Returns:
+        Streaming response with one JSON object per history entry
+    """
+    
+    if not await get_workflow_manager().get_workflow_state(workflow_id):
+        raise HTTPException(
+            status_code=404,
+            detail=f"Workflow {workflow_id} not found"
+        )
+    
+    if limit < 1:
+        raise HTTPException(
+            status_code=400,
+            detail="limit must be at least 1"
+        )
+    
+    workflow_manager = get_workflow_manager()
+    history = workflow_manager.get_workflow_history(workflow_id, limit=limit)
+    
+    return StreamingResponse(
+        (_encode_history_entry(entry) async for entry in history),
+        media_type="application/x-ndjson"
+    )
+
+
 @router.post("/approve")
 async def handle_approval(
     request: ApprovalRequest,
@@ -271,7 +402,7 @@ async def handle_approval(
     
     try:
         state_manager = get_state_manager()
-        workflow_state = state_manager.get_workflow_state(request.workflow_id)
+        workflow_state = await get_workflow_manager().get_workflow_state(request.workflow_id)
         
         if not workflow_state:
             raise HTTPException(
@@ -356,7 +487,7 @@ async def reset_workflow(workflow_id: str) -> Dict[str, Any]:
     
     try:
         state_manager = get_state_manager()
-        workflow_state = state_manager.get_workflow_state(workflow_id)
+        workflow_state = await get_workflow_manager().get_workflow_state(workflow_id)
         
         if not workflow_state:
             raise HTTPException(
@@ -381,9 +512,11 @@ async def reset_workflow(workflow_id: str) -> Dict[str, Any]:
             "last_user_action": None,
             "retry_count": 0,
             "last_error": None,
-            "generated_files": {}
+            "generated_files": {},
+            "written_file_paths": None
         }
         
+        discard_speculative_draft(workflow_id)
         updated_state = state_manager.update_workflow_state(workflow_id, reset_updates)
         
         return {
@@ -456,9 +589,7 @@ async def delete_workflow(workflow_id: str) -> Dict[str, Any]:
     """
     
     try:
-        state_manager = get_state_manager()
-        
-        if not state_manager.get_workflow_state(workflow_id):
+        if not await get_workflow_manager().get_workflow_state(workflow_id):
             raise HTTPException(
                 status_code=404,
                 detail=f"Workflow {workflow_id} not found"
@@ -467,7 +598,7 @@ async def delete_workflow(workflow_id: str) -> Dict[str, Any]:
         logger.info(f"Deleting workflow {workflow_id}")
         
         # Clean up workflow
-        success = state_manager.cleanup_workflow(workflow_id)
+        success = await get_workflow_manager().delete_workflow(workflow_id)
         
         if success:
             return {
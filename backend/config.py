@@ -35,11 +35,19 @@ class Settings(BaseSettings):
     default_model: str = Field("gpt-4.1", env="DEFAULT_MODEL")
     max_tokens: int = Field(4000, env="MAX_TOKENS")
     temperature: float = Field(0.7, env="TEMPERATURE")
+    llm_max_concurrency: int = Field(32, env="LLM_MAX_CONCURRENCY")  # In-flight LLM calls across all workflows
     
     # Workflow Configuration
     approval_timeout: int = Field(3600, env="APPROVAL_TIMEOUT")  # 1 hour
     max_revision_attempts: int = Field(3, env="MAX_REVISION_ATTEMPTS")
     enable_research: bool = Field(True, env="ENABLE_RESEARCH")
+    workflow_batch_concurrency: int = Field(4, env="WORKFLOW_BATCH_CONCURRENCY")
+    speculative_generation: bool = Field(False, env="SPECULATIVE_GENERATION")  # Draft next phase during review
+    
+    # Workflow checkpoint persistence (memory, sqlite or postgres)
+    checkpointer_backend: str = Field("memory", env="CHECKPOINTER_BACKEND")
+    checkpointer_conn_string: str = Field(".specbot/spec_bot.db", env="CHECKPOINTER_CONN_STRING")
+    checkpoint_cache_size: int = Field(1024, env="CHECKPOINT_CACHE_SIZE")
     
     class Config:
         env_file = ".env"
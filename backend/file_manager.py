@@ -3,6 +3,7 @@ File system management for Spec-Bot generated documents.
 Handles writing files to disk, versioning, and backup operations.
 """
 
+import asyncio
 import logging
 import os
 import shutil
@@ -11,6 +12,9 @@ from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import json
 
+import aiofiles
+import aiofiles.os
+
 from config import settings
 
 logger = logging.getLogger(__name__)
@@ -109,6 +113,69 @@ class FileManager:
             logger.error(f"Error writing specification files: {e}")
             raise
     
+    async def awrite_specification_files(
+        self, 
+        workflow_id: str,
+        feature_name: str,
+        files: Dict[str, str],
+        create_backup: bool = True
+    ) -> Dict[str, str]:
+        """
+        Write generated specification files to disk without blocking the event loop.
+        
+        Same behavior as write_specification_files, but the files are written
+        concurrently.
+        
+        Args:
+            workflow_id: Unique workflow identifier
+            feature_name: Name of the feature
+            files: Dictionary of filename -> content
+            create_backup: Whether to create backup of existing files
+            
+        Returns:
+            Dictionary of filename -> written file path
+        """
+        
+        try:
+            # Create feature directory
+            feature_dir = await asyncio.to_thread(self.create_spec_directory, feature_name)
+            
+            async def write_file(filename: str, content: str) -> Tuple[str, str]:
+                file_path = feature_dir / filename
+                
+                # Create backup if file exists and backup is requested
+                if create_backup and await aiofiles.os.path.exists(file_path):
+                    await asyncio.to_thread(self._create_file_backup, file_path, workflow_id)
+                
+                # Write the new content
+                await self._awrite_file_atomic(file_path, content)
+                logger.info(f"Wrote file: {file_path}")
+                
+                return filename, str(file_path)
+            
+            written_files = dict(await asyncio.gather(
+                *(write_file(filename, content) for filename, content in files.items())
+            ))
+            
+            # Create metadata file
+            metadata = {
+                "workflow_id": workflow_id,
+                "feature_name": feature_name,
+                "generated_at": datetime.utcnow().isoformat(),
+                "files": list(files.keys()),
+                "file_paths": written_files
+            }
+            
+            metadata_path = feature_dir / "metadata.json"
+            await self._awrite_file_atomic(metadata_path, json.dumps(metadata, indent=2))
+            
+            logger.info(f"Successfully wrote {len(files)} files for {feature_name}")
+            return written_files
+            
+        except Exception as e:
+            logger.error(f"Error writing specification files: {e}")
+            raise
+    
     def read_specification_files(self, feature_name: str) -> Optional[Dict[str, str]]:
         """
         Read existing specification files from disk.
@@ -343,6 +410,29 @@ class FileManager:
                 temp_path.unlink()
             raise
     
+    async def _awrite_file_atomic(self, file_path: Path, content: str) -> None:
+        """
+        Write file content atomically without blocking the event loop.
+        
+        Args:
+            file_path: Target file path
+            content: Content to write
+        """
+        
+        # Write to temporary file first
+        temp_path = file_path.with_suffix(f"{file_path.suffix}.tmp")
+        
+        try:
+            async with aiofiles.open(temp_path, "w", encoding="utf-8") as f:
+                await f.write(content)
+            # Atomic move to final location
+            await aiofiles.os.replace(temp_path, file_path)
+        except Exception:
+            # Clean up temp file if something went wrong
+            if await aiofiles.os.path.exists(temp_path):
+                await aiofiles.os.remove(temp_path)
+            raise
+    
     def cleanup_old_backups(self, days_to_keep: int = 30) -> int:
         """
         Clean up old backup files.
@@ -4,12 +4,14 @@ Supports OpenAI and Anthropic APIs with unified interface and error handling.
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any, List, Union
+from typing import Optional, Dict, Any, AsyncIterator, List, Union
 import logging
 import asyncio
+import time
 from dataclasses import dataclass
 from enum import Enum
 
+import httpx
 import openai
 import anthropic
 from config import settings
@@ -17,6 +19,23 @@ from config import settings
 logger = logging.getLogger(__name__)
 
 
+# Idle pooled connections are kept this long (seconds) so the next phase can
+# reuse them after a user reviews the previous one; httpx defaults to 5 seconds
+HTTP_KEEPALIVE_EXPIRY = 120.0
+
+
+def _create_http_client() -> httpx.AsyncClient:
+    """Create the HTTP client for a provider SDK, matching the SDKs' own defaults apart from keepalive"""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=100,
+            max_keepalive_connections=20,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+        ),
+        follow_redirects=True
+    )
+
+
 class LLMError(Exception):
     """Base exception for LLM-related errors"""
     pass
@@ -37,12 +56,23 @@ class ModelNotFoundError(LLMError):
     pass
 
 
+class ServiceUnavailableError(LLMError):
+    """Raised when the provider is temporarily unreachable (connection errors, timeouts, 5xx)"""
+    pass
+
+
+class CircuitOpenError(LLMError):
+    """Raised when calls to a provider are suspended after repeated outages"""
+    pass
+
+
 @dataclass
 class LLMMessage:
     """Standardized message format for LLM communication"""
     role: str  # "user", "assistant", "system"
     content: str
     metadata: Optional[Dict[str, Any]] = None
+    cache_control: Optional[Dict[str, str]] = None  # Provider prompt caching hint, e.g. {"type": "ephemeral"}
 
 
 @dataclass
@@ -58,6 +88,8 @@ class LLMResponse:
 class LLMClient(ABC):
     """Abstract base class for LLM providers"""
     
+    provider = "unknown"
+    
     def __init__(self, api_key: str, model_name: str = "default"):
         """Initialize the LLM client with API key and model"""
         self.api_key = api_key
@@ -81,6 +113,20 @@ class LLMClient(ABC):
         """Generate a response from the LLM"""
         pass
     
+    async def stream(
+        self,
+        messages: List[LLMMessage],
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Stream response text from the LLM as it is generated.
+        Providers without streaming support yield the whole response at once.
+        """
+        response = await self.generate(messages, max_tokens, temperature, **kwargs)
+        yield response.content
+    
     @abstractmethod
     def get_available_models(self) -> List[str]:
         """Get list of available models for this provider"""
@@ -100,12 +146,14 @@ class LLMClient(ABC):
 class OpenAIClient(LLMClient):
     """OpenAI API client implementation"""
     
+    provider = "openai"
+    
     def _initialize_client(self) -> None:
         """Initialize OpenAI client"""
         if not self.api_key:
             raise AuthenticationError("OpenAI API key is required")
         
-        self.client = openai.AsyncOpenAI(api_key=self.api_key)
+        self.client = openai.AsyncOpenAI(api_key=self.api_key, http_client=_create_http_client())
         
         # Set default model if not specified
         if self.model_name == "default":
@@ -180,6 +228,64 @@ class OpenAIClient(LLMClient):
             logger.error(f"OpenAI model not found: {e}")
             raise ModelNotFoundError(f"OpenAI model '{self.model_name}' not found: {e}")
         
+        except (openai.APIConnectionError, openai.InternalServerError) as e:
+            logger.error(f"OpenAI service unavailable: {e}")
+            raise ServiceUnavailableError(f"OpenAI service unavailable: {e}")
+        
+        except Exception as e:
+            logger.error(f"OpenAI API error: {e}")
+            raise LLMError(f"OpenAI API error: {e}")
+    
+    async def stream(
+        self,
+        messages: List[LLMMessage],
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream response text using OpenAI API"""
+        try:
+            openai_messages = [
+                {"role": msg.role, "content": msg.content} 
+                for msg in messages
+            ]
+            
+            if max_tokens is None:
+                max_tokens = settings.max_tokens
+            if temperature is None:
+                temperature = settings.temperature
+            
+            logger.info(f"Streaming response with OpenAI model: {self.model_name}")
+            
+            response_stream = await self.client.chat.completions.create(
+                model=self.model_name,
+                messages=openai_messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                stream=True,
+                **kwargs
+            )
+            
+            async for chunk in response_stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        
+        except openai.RateLimitError as e:
+            logger.error(f"OpenAI rate limit exceeded: {e}")
+            raise RateLimitError(f"OpenAI rate limit exceeded: {e}")
+        
+        except openai.AuthenticationError as e:
+            logger.error(f"OpenAI authentication failed: {e}")
+            raise AuthenticationError(f"OpenAI authentication failed: {e}")
+        
+        except openai.NotFoundError as e:
+            logger.error(f"OpenAI model not found: {e}")
+            raise ModelNotFoundError(f"OpenAI model '{self.model_name}' not found: {e}")
+        
+        except (openai.APIConnectionError, openai.InternalServerError) as e:
+            logger.error(f"OpenAI service unavailable: {e}")
+            raise ServiceUnavailableError(f"OpenAI service unavailable: {e}")
+        
         except Exception as e:
             logger.error(f"OpenAI API error: {e}")
             raise LLMError(f"OpenAI API error: {e}")
@@ -204,12 +310,14 @@ class OpenAIClient(LLMClient):
 class AnthropicClient(LLMClient):
     """Anthropic Claude API client implementation"""
     
+    provider = "anthropic"
+    
     def _initialize_client(self) -> None:
         """Initialize Anthropic client"""
         if not self.api_key:
             raise AuthenticationError("Anthropic API key is required")
         
-        self.client = anthropic.AsyncAnthropic(api_key=self.api_key)
+        self.client = anthropic.AsyncAnthropic(api_key=self.api_key, http_client=_create_http_client())
         
         # Set default model if not specified
         if self.model_name == "default":
@@ -230,7 +338,7 @@ class AnthropicClient(LLMClient):
             
             for msg in messages:
                 if msg.role == "system":
-                    system_message = msg.content
+                    system_message = self._system_content(msg)
                 else:
                     conversation_messages.append({
                         "role": msg.role,
@@ -302,10 +410,84 @@ class AnthropicClient(LLMClient):
             logger.error(f"Anthropic model not found: {e}")
             raise ModelNotFoundError(f"Anthropic model '{self.model_name}' not found: {e}")
         
+        except (anthropic.APIConnectionError, anthropic.InternalServerError) as e:
+            logger.error(f"Anthropic service unavailable: {e}")
+            raise ServiceUnavailableError(f"Anthropic service unavailable: {e}")
+        
         except Exception as e:
             logger.error(f"Anthropic API error: {e}")
             raise LLMError(f"Anthropic API error: {e}")
     
+    async def stream(
+        self,
+        messages: List[LLMMessage],
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream response text using Anthropic Claude API"""
+        try:
+            system_message = None
+            conversation_messages = []
+            
+            for msg in messages:
+                if msg.role == "system":
+                    system_message = self._system_content(msg)
+                else:
+                    conversation_messages.append({
+                        "role": msg.role,
+                        "content": msg.content
+                    })
+            
+            if max_tokens is None:
+                max_tokens = settings.max_tokens
+            if temperature is None:
+                temperature = settings.temperature
+            
+            logger.info(f"Streaming response with Anthropic model: {self.model_name}")
+            
+            api_params = {
+                "model": self.model_name,
+                "messages": conversation_messages,
+                "max_tokens": max_tokens,
+                "temperature": temperature,
+                **kwargs
+            }
+            
+            if system_message:
+                api_params["system"] = system_message
+            
+            async with self.client.messages.stream(**api_params) as response_stream:
+                async for text in response_stream.text_stream:
+                    yield text
+        
+        except anthropic.RateLimitError as e:
+            logger.error(f"Anthropic rate limit exceeded: {e}")
+            raise RateLimitError(f"Anthropic rate limit exceeded: {e}")
+        
+        except anthropic.AuthenticationError as e:
+            logger.error(f"Anthropic authentication failed: {e}")
+            raise AuthenticationError(f"Anthropic authentication failed: {e}")
+        
+        except anthropic.NotFoundError as e:
+            logger.error(f"Anthropic model not found: {e}")
+            raise ModelNotFoundError(f"Anthropic model '{self.model_name}' not found: {e}")
+        
+        except (anthropic.APIConnectionError, anthropic.InternalServerError) as e:
+            logger.error(f"Anthropic service unavailable: {e}")
+            raise ServiceUnavailableError(f"Anthropic service unavailable: {e}")
+        
+        except Exception as e:
+            logger.error(f"Anthropic API error: {e}")
+            raise LLMError(f"Anthropic API error: {e}")
+    
+    @staticmethod
+    def _system_content(msg: LLMMessage) -> Union[str, List[Dict[str, Any]]]:
+        """Convert a system message, as a cacheable text block when it asks for caching"""
+        if msg.cache_control:
+            return [{"type": "text", "text": msg.content, "cache_control": msg.cache_control}]
+        return msg.content
+    
     def get_available_models(self) -> List[str]:
         """Get available Anthropic models"""
         return [
@@ -318,6 +500,55 @@ class AnthropicClient(LLMClient):
         ]
 
 
+class CircuitBreaker:
+    """
+    Suspends calls to a provider after consecutive outages.
+    
+    After `failure_threshold` consecutive failures the circuit opens and calls
+    fail fast with CircuitOpenError. Once `reset_timeout` seconds have passed,
+    calls are let through again; a success closes the circuit and another
+    failure re-opens it.
+    """
+    
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+    
+    def before_call(self) -> None:
+        """Raise CircuitOpenError while the circuit is open"""
+        if self.opened_at is not None and time.monotonic() - self.opened_at < self.reset_timeout:
+            raise CircuitOpenError(
+                f"{self.name} calls suspended after {self.failures} consecutive failures"
+            )
+    
+    def record_success(self) -> None:
+        """Close the circuit"""
+        self.failures = 0
+        self.opened_at = None
+    
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit at the threshold"""
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            logger.warning(f"{self.name} circuit opened for {self.reset_timeout}s after {self.failures} consecutive failures")
+
+
+# One circuit per provider, shared by all clients and workflows
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    """Get the circuit breaker for a provider"""
+    breaker = _circuit_breakers.get(provider)
+    if breaker is None:
+        breaker = _circuit_breakers[provider] = CircuitBreaker(provider)
+    return breaker
+
+
 class LLMClientFactory:
     """Factory class for creating LLM clients"""
     
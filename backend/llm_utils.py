@@ -17,6 +17,16 @@ from llm_client import LLMMessage, LLMResponse, LLMClient, get_llm_client
 logger = logging.getLogger(__name__)
 
 
+# JSON in a markdown code block
+_JSON_BLOCK_PATTERN = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL | re.IGNORECASE)
+
+# JSON object (one level of nesting) anywhere in the text
+_JSON_OBJECT_PATTERN = re.compile(r'(\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\})', re.DOTALL)
+
+# Characters that mark a response as markdown
+_MARKDOWN_MARKERS = ('#', '##', '###', '```', '*', '-', '|')
+
+
 class ParseMode(str, Enum):
     """Response parsing modes"""
     JSON = "json"
@@ -58,8 +68,7 @@ class LLMResponseProcessor:
         content = content.strip()
         
         # Pattern 1: JSON in markdown code block
-        json_block_pattern = r'```(?:json)?\s*(\{.*?\})\s*```'
-        match = re.search(json_block_pattern, content, re.DOTALL | re.IGNORECASE)
+        match = _JSON_BLOCK_PATTERN.search(content)
         if match:
             logger.debug("Found JSON in markdown code block")
             return match.group(1).strip(), ParseMode.JSON
@@ -70,8 +79,7 @@ class LLMResponseProcessor:
             return content, ParseMode.JSON
         
         # Pattern 3: JSON somewhere in the middle
-        json_pattern = r'(\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\})'
-        matches = re.findall(json_pattern, content, re.DOTALL)
+        matches = _JSON_OBJECT_PATTERN.findall(content)
         
         for match in matches:
             try:
@@ -83,7 +91,7 @@ class LLMResponseProcessor:
                 continue
         
         # Pattern 4: Check if it's markdown content
-        if any(marker in content for marker in ['#', '##', '###', '```', '*', '-', '|']):
+        if any(marker in content for marker in _MARKDOWN_MARKERS):
             logger.debug("Detected markdown content")
             return content, ParseMode.MARKDOWN
         
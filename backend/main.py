@@ -13,6 +13,8 @@ from contextlib import asynccontextmanager
 # Import API routers
 from api.workflow_routes import router as workflow_router
 from api.file_routes import router as file_router
+from workflow import get_workflow_manager
+from template_engine import get_template_engine
 
 # Configure logging
 logging.basicConfig(
@@ -27,9 +29,12 @@ async def lifespan(app: FastAPI):
     """Application lifespan manager for startup and shutdown events"""
     # Startup
     logger.info("Starting Spec-Bot backend...")
+    # Compile spec templates up front so the first completed workflow doesn't pay for it
+    get_template_engine().preload_templates()
     yield
     # Shutdown
     logger.info("Shutting down Spec-Bot backend...")
+    await get_workflow_manager().close()
 
 
 # Initialize FastAPI app
@@ -78,11 +83,19 @@ async def health_check():
 if __name__ == "__main__":
     import uvicorn
     
+    # uvloop's libuv-based loop where it is installed (not on Windows), asyncio otherwise
+    try:
+        import uvloop  # noqa: F401
+        event_loop = "uvloop"
+    except ImportError:
+        event_loop = "asyncio"
+    
     # Run with hot reload for development
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
         reload=True,
-        log_level="info"
+        log_level="info",
+        loop=event_loop
     ) 
\ No newline at end of file
@@ -150,6 +150,11 @@ class StartWorkflowRequest(BaseModel):
     enable_research: Optional[bool] = Field(default=True)
 
 
+class BatchStartWorkflowRequest(BaseModel):
+    """Request to start several spec generation workflows at once"""
+    workflows: List[StartWorkflowRequest] = Field(..., min_length=1, max_length=20)
+
+
 class ApprovalRequest(BaseModel):
     """Request to approve or request revision for a phase"""
     workflow_id: str = Field(...)
@@ -42,12 +42,15 @@ class TemplateEngine:
         self.template_dir.mkdir(parents=True, exist_ok=True)
         
         # Initialize Jinja2 environment
+        # Compiled templates stay in the environment's cache; outside development
+        # skip the per-render mtime check since templates only change on deploy
         self.env = Environment(
             loader=FileSystemLoader(self.template_dir),
             autoescape=select_autoescape(['html', 'xml']),
             trim_blocks=True,
             lstrip_blocks=True,
-            keep_trailing_newline=True
+            keep_trailing_newline=True,
+            auto_reload=settings.environment == "development"
         )
         
         # Add custom filters and functions
@@ -137,6 +140,21 @@ class TemplateEngine:
             logger.error(f"Template not found: {template_name}")
             raise TemplateNotFound(f"Template '{template_name}' not found in {self.template_dir}")
     
+    def preload_templates(self) -> int:
+        """
+        Compile every available template into the environment cache.
+        
+        Returns:
+            Number of templates compiled
+        """
+        templates = self.list_templates()
+        
+        for template_name in templates:
+            self.get_template(template_name)
+        
+        logger.info(f"Precompiled {len(templates)} templates")
+        return len(templates)
+    
     def render_template(
         self, 
         template_name: str, 
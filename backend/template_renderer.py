@@ -14,10 +14,19 @@ from models import SpecState, WorkflowPhase
 
 logger = logging.getLogger(__name__)
 
+# Matches the labelled sections inside a design component block; Key Methods
+# is only captured when fenced, Responsibilities runs up to the next bold label
+_COMPONENT_LABEL_PATTERN = re.compile(
+    r"\*\*(Responsibilities|Key Methods):\*\*\s*(?:```[a-zA-Z]*\s*(.*?)\s*```|(.*?)(?=\*\*|$))",
+    re.DOTALL
+)
+
 
 class SpecRenderer:
     """High-level renderer for specification documents"""
     
+    __slots__ = ("engine",)
+    
     def __init__(self, template_engine: Optional[TemplateEngine] = None):
         """Initialize renderer with optional custom template engine"""
         self.engine = template_engine or get_template_engine()
@@ -299,17 +308,16 @@ class SpecRenderer:
                     "content": content_match.strip()
                 }
                 
-                # Extract responsibilities
-                resp_match = re.search(r"\*\*Responsibilities:\*\*\s*(.*?)(?=\*\*|$)", content_match, re.DOTALL)
-                if resp_match:
-                    resp_text = resp_match.group(1).strip()
-                    responsibilities = re.findall(r"^[-*]\s*(.+)$", resp_text, re.MULTILINE)
-                    component["responsibilities"] = [resp.strip() for resp in responsibilities]
-                
-                # Extract key methods
-                methods_match = re.search(r"\*\*Key Methods:\*\*\s*```[a-zA-Z]*\s*(.*?)\s*```", content_match, re.DOTALL)
-                if methods_match:
-                    component["key_methods"] = methods_match.group(1).strip()
+                # Extract responsibilities and key methods in a single pass
+                for label_match in _COMPONENT_LABEL_PATTERN.finditer(content_match):
+                    label, fenced_text, plain_text = label_match.groups()
+                    
+                    if label == "Responsibilities" and "responsibilities" not in component:
+                        resp_text = (fenced_text if fenced_text is not None else plain_text).strip()
+                        responsibilities = re.findall(r"^[-*]\s*(.+)$", resp_text, re.MULTILINE)
+                        component["responsibilities"] = [resp.strip() for resp in responsibilities]
+                    elif label == "Key Methods" and fenced_text is not None and "key_methods" not in component:
+                        component["key_methods"] = fenced_text.strip()
                 
                 components.append(component)
             
@@ -390,29 +398,41 @@ class SpecRenderer:
         return data
 
 
+# Global spec renderer instance
+_spec_renderer = None
+
+
+def get_spec_renderer() -> SpecRenderer:
+    """Get the global spec renderer instance"""
+    global _spec_renderer
+    if _spec_renderer is None:
+        _spec_renderer = SpecRenderer()
+    return _spec_renderer
+
+
 # Convenience functions
 
 def render_requirements_doc(spec_state: SpecState, **kwargs) -> str:
     """Convenience function to render requirements document"""
-    renderer = SpecRenderer()
+    renderer = get_spec_renderer()
     return renderer.render_requirements(spec_state, **kwargs)
 
 
 def render_design_doc(spec_state: SpecState, **kwargs) -> str:
     """Convenience function to render design document"""
-    renderer = SpecRenderer()
+    renderer = get_spec_renderer()
     return renderer.render_design(spec_state, **kwargs)
 
 
 def render_tasks_doc(spec_state: SpecState, **kwargs) -> str:
     """Convenience function to render tasks document"""
-    renderer = SpecRenderer()
+    renderer = get_spec_renderer()
     return renderer.render_tasks(spec_state, **kwargs)
 
 
 def render_all_docs(spec_state: SpecState, **kwargs) -> Dict[str, str]:
     """Convenience function to render all documents"""
-    renderer = SpecRenderer()
+    renderer = get_spec_renderer()
     return renderer.render_all_documents(spec_state, **kwargs)
 
 
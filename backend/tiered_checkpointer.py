@@ -0,0 +1,200 @@
+"""
+Tiered checkpoint storage for Spec-Bot LangGraph workflows.
+Keeps recently used checkpoints in a bounded in-memory LRU in front of a persistent saver.
+"""
+
+import logging
+from copy import deepcopy
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, AsyncIterator, Optional, Sequence, Tuple
+
+from langgraph.checkpoint.base import BaseCheckpointSaver, CheckpointTuple
+
+logger = logging.getLogger(__name__)
+
+# (thread_id, checkpoint_ns, checkpoint_id)
+CacheKey = Tuple[str, str, str]
+
+
+class TieredCheckpointSaver(BaseCheckpointSaver):
+    """
+    Write-through checkpoint saver with an LRU read cache.
+    
+    Checkpoints for active threads (resume, status polls, history tail) are
+    served from memory, while every write goes straight to the upstream saver,
+    so cold threads live only in persistent storage and memory stays bounded.
+    The cache assumes this process is the only writer for a given thread.
+    Cached tuples are copied in and out, so callers can't mutate them.
+    """
+    
+    def __init__(self, upstream: BaseCheckpointSaver, maxsize: int = 1024):
+        """
+        Initialize the tiered saver.
+        
+        Args:
+            upstream: Persistent saver that stores every checkpoint
+            maxsize: Maximum number of checkpoints kept in memory
+        """
+        super().__init__(serde=upstream.serde)
+        self.upstream = upstream
+        self.maxsize = maxsize
+        
+        self._cache: "OrderedDict[CacheKey, CheckpointTuple]" = OrderedDict()
+        # Latest checkpoint id per (thread_id, checkpoint_ns), bounded like the cache;
+        # a missing entry only means the next lookup goes upstream
+        self._latest: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        
+        # Working-set metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @property
+    def config_specs(self) -> list:
+        return self.upstream.config_specs
+    
+    def cache_info(self) -> Dict[str, int]:
+        """Get cache hit, miss and eviction counters"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._cache),
+            "maxsize": self.maxsize
+        }
+    
+    # Reads
+    
+    def get_tuple(self, config: Dict[str, Any]) -> Optional[CheckpointTuple]:
+        """Get a checkpoint tuple, serving it from memory when cached"""
+        cached = self._cache_lookup(config)
+        if cached is not None:
+            return cached
+        
+        checkpoint_tuple = self.upstream.get_tuple(config)
+        self._cache_store(config, checkpoint_tuple)
+        return checkpoint_tuple
+    
+    async def aget_tuple(self, config: Dict[str, Any]) -> Optional[CheckpointTuple]:
+        """Get a checkpoint tuple, serving it from memory when cached"""
+        cached = self._cache_lookup(config)
+        if cached is not None:
+            return cached
+        
+        checkpoint_tuple = await self.upstream.aget_tuple(config)
+        self._cache_store(config, checkpoint_tuple)
+        return checkpoint_tuple
+    
+    def list(self, config: Optional[Dict[str, Any]], **kwargs) -> Iterator[CheckpointTuple]:
+        """List checkpoints from the upstream saver"""
+        return self.upstream.list(config, **kwargs)
+    
+    def alist(self, config: Optional[Dict[str, Any]], **kwargs) -> AsyncIterator[CheckpointTuple]:
+        """List checkpoints from the upstream saver"""
+        return self.upstream.alist(config, **kwargs)
+    
+    # Writes
+    
+    def put(self, config: Dict[str, Any], checkpoint: Dict[str, Any], *args, **kwargs) -> Dict[str, Any]:
+        """Write a checkpoint through to the upstream saver"""
+        next_config = self.upstream.put(config, checkpoint, *args, **kwargs)
+        self._record_latest(next_config)
+        return next_config
+    
+    async def aput(self, config: Dict[str, Any], checkpoint: Dict[str, Any], *args, **kwargs) -> Dict[str, Any]:
+        """Write a checkpoint through to the upstream saver"""
+        next_config = await self.upstream.aput(config, checkpoint, *args, **kwargs)
+        self._record_latest(next_config)
+        return next_config
+    
+    def put_writes(self, config: Dict[str, Any], writes: Sequence[Tuple[str, Any]], *args, **kwargs) -> None:
+        """Write pending writes through and drop the now-stale cached checkpoint"""
+        self.upstream.put_writes(config, writes, *args, **kwargs)
+        self._invalidate(config)
+    
+    async def aput_writes(self, config: Dict[str, Any], writes: Sequence[Tuple[str, Any]], *args, **kwargs) -> None:
+        """Write pending writes through and drop the now-stale cached checkpoint"""
+        await self.upstream.aput_writes(config, writes, *args, **kwargs)
+        self._invalidate(config)
+    
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete a thread upstream and forget its cached checkpoints"""
+        self.upstream.delete_thread(thread_id)
+        self._forget_thread(thread_id)
+    
+    async def adelete_thread(self, thread_id: str) -> None:
+        """Delete a thread upstream and forget its cached checkpoints"""
+        await self.upstream.adelete_thread(thread_id)
+        self._forget_thread(thread_id)
+    
+    def get_next_version(self, current: Optional[Any], channel: Any) -> Any:
+        return self.upstream.get_next_version(current, channel)
+    
+    # Cache bookkeeping
+    
+    def _cache_lookup(self, config: Dict[str, Any]) -> Optional[CheckpointTuple]:
+        """Find a cached checkpoint for the config, counting hits and misses"""
+        configurable = config.get("configurable", {})
+        thread_key = (configurable.get("thread_id"), configurable.get("checkpoint_ns", ""))
+        
+        checkpoint_id = configurable.get("checkpoint_id") or self._latest.get(thread_key)
+        key = (*thread_key, checkpoint_id)
+        
+        if checkpoint_id is not None and key in self._cache:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return deepcopy(self._cache[key])
+        
+        self.misses += 1
+        return None
+    
+    def _cache_store(self, config: Dict[str, Any], checkpoint_tuple: Optional[CheckpointTuple]) -> None:
+        """Cache a checkpoint read from upstream, evicting the least recently used"""
+        if checkpoint_tuple is None:
+            return
+        
+        key = self._key_for(checkpoint_tuple.config)
+        self._cache[key] = deepcopy(checkpoint_tuple)
+        self._cache.move_to_end(key)
+        
+        # A lookup without a checkpoint id resolved the thread's latest checkpoint
+        if not config.get("configurable", {}).get("checkpoint_id"):
+            self._set_latest(key)
+        
+        while len(self._cache) > self.maxsize:
+            evicted_key, _ = self._cache.popitem(last=False)
+            if self._latest.get(evicted_key[:2]) == evicted_key[2]:
+                del self._latest[evicted_key[:2]]
+            self.evictions += 1
+            logger.debug(f"Evicted checkpoint {evicted_key[2]} of thread {evicted_key[0]} from cache")
+    
+    def _record_latest(self, config: Dict[str, Any]) -> None:
+        """Remember the newest checkpoint written for a thread"""
+        self._set_latest(self._key_for(config))
+    
+    def _set_latest(self, key: CacheKey) -> None:
+        """Record a thread's latest checkpoint id, forgetting the least recently used thread"""
+        self._latest[key[:2]] = key[2]
+        self._latest.move_to_end(key[:2])
+        while len(self._latest) > self.maxsize:
+            self._latest.popitem(last=False)
+    
+    def _invalidate(self, config: Dict[str, Any]) -> None:
+        """Drop a cached checkpoint whose pending writes changed"""
+        self._cache.pop(self._key_for(config), None)
+    
+    def _forget_thread(self, thread_id: str) -> None:
+        """Drop every cached checkpoint of a thread"""
+        for key in [key for key in self._cache if key[0] == thread_id]:
+            del self._cache[key]
+        for thread_key in [thread_key for thread_key in self._latest if thread_key[0] == thread_id]:
+            del self._latest[thread_key]
+    
+    @staticmethod
+    def _key_for(config: Dict[str, Any]) -> CacheKey:
+        configurable = config["configurable"]
+        return (
+            configurable["thread_id"],
+            configurable.get("checkpoint_ns", ""),
+            configurable.get("checkpoint_id")
+        )
@@ -3,11 +3,18 @@ Complete LangGraph workflow for Spec-Bot specification generation.
 Orchestrates the three-phase workflow with human-in-the-loop approvals.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, Literal, Optional, List
+from collections import namedtuple
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Any, AsyncIterator, Literal, Optional, List, Tuple, Union
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
 
+from config import settings
+from tiered_checkpointer import TieredCheckpointSaver
 from workflow_state import WorkflowGraphState, WorkflowStatus, get_state_manager
 from workflow_nodes import (
     generate_requirements_node,
@@ -15,24 +22,44 @@ from workflow_nodes import (
     generate_tasks_node,
     human_approval_gate_node,
     generate_final_documents_node,
-    should_generate_requirements,
-    should_generate_design,
-    should_generate_tasks,
     should_wait_for_approval,
-    should_generate_final_documents,
-    is_workflow_complete,
-    is_workflow_failed
+    start_speculative_generation
 )
 
 logger = logging.getLogger(__name__)
 
+# Conditional edge targets for each node, shared by every graph build.
+# Kept as plain dicts: LangGraph only copies path maps that are dict instances.
+_REQUIREMENTS_ROUTES = {
+    "human_approval": "human_approval",
+    "generate_requirements": "generate_requirements",  # Retry on error
+    "end": END
+}
 
-async def determine_start_node(state: WorkflowGraphState) -> WorkflowGraphState:
-    """
-    Entry point node that determines the first action based on workflow state.
-    """
-    logger.info(f"Determining start action for workflow {state['workflow_id']}")
-    return state
+_DESIGN_ROUTES = {
+    "human_approval": "human_approval",
+    "generate_design": "generate_design",  # Retry on error
+    "end": END
+}
+
+_TASKS_ROUTES = {
+    "human_approval": "human_approval",
+    "generate_tasks": "generate_tasks",  # Retry on error
+    "end": END
+}
+
+_APPROVAL_ROUTES = {
+    "generate_requirements": "generate_requirements",
+    "generate_design": "generate_design",
+    "generate_tasks": "generate_tasks",
+    "generate_final_documents": "generate_final_documents",
+    "end": END
+}
+
+_FINAL_DOCUMENTS_ROUTES = {
+    "end": END,
+    "generate_final_documents": "generate_final_documents"  # Retry on error
+}
 
 
 def create_spec_workflow() -> StateGraph:
@@ -47,255 +74,280 @@ def create_spec_workflow() -> StateGraph:
     workflow = StateGraph(WorkflowGraphState)
     
     # Add nodes
-    workflow.add_node("determine_start", determine_start_node)
     workflow.add_node("generate_requirements", generate_requirements_node)
     workflow.add_node("generate_design", generate_design_node)
     workflow.add_node("generate_tasks", generate_tasks_node)
+    # Deliberately no cache policy: the gate's output is the user's decision, which
+    # differs between resumes that share the same checkpointed input
     workflow.add_node("human_approval", human_approval_gate_node)
     workflow.add_node("generate_final_documents", generate_final_documents_node)
     
-    # Set entry point
-    workflow.set_entry_point("determine_start")
+    # Set entry point - later phases are reached by resuming from the approval interrupt,
+    # so new runs always start at requirements and need no start node or entry router
+    workflow.set_entry_point("generate_requirements")
     
     # Add edges and conditional routing
-    
-    # From start determination
-    workflow.add_conditional_edges(
-        "determine_start",
-        _route_from_start,
-        {
-            "generate_requirements": "generate_requirements",
-            "generate_design": "generate_design", 
-            "generate_tasks": "generate_tasks",
-            "human_approval": "human_approval",
-            "generate_final_documents": "generate_final_documents",
-            "end": END
-        }
-    )
+    # Phases run one LLM call each, strictly in sequence: the design and tasks prompts
+    # embed the approved (possibly revised) output of the previous phase
     
     # From requirements generation
-    workflow.add_conditional_edges(
-        "generate_requirements",
-        _route_from_requirements,
-        {
-            "human_approval": "human_approval",
-            "generate_requirements": "generate_requirements",  # Retry on error
-            "end": END
-        }
-    )
+    workflow.add_conditional_edges("generate_requirements", _route_from_requirements, _REQUIREMENTS_ROUTES)
     
     # From design generation
-    workflow.add_conditional_edges(
-        "generate_design",
-        _route_from_design,
-        {
-            "human_approval": "human_approval",
-            "generate_design": "generate_design",  # Retry on error
-            "end": END
-        }
-    )
+    workflow.add_conditional_edges("generate_design", _route_from_design, _DESIGN_ROUTES)
     
     # From tasks generation
-    workflow.add_conditional_edges(
-        "generate_tasks",
-        _route_from_tasks,
-        {
-            "human_approval": "human_approval",
-            "generate_tasks": "generate_tasks",  # Retry on error
-            "end": END
-        }
-    )
+    workflow.add_conditional_edges("generate_tasks", _route_from_tasks, _TASKS_ROUTES)
     
-    # From human approval gate - should only continue after approval, never loop back
-    workflow.add_conditional_edges(
-        "human_approval",
-        _route_from_approval,
-        {
-            "generate_requirements": "generate_requirements",
-            "generate_design": "generate_design", 
-            "generate_tasks": "generate_tasks",
-            "generate_final_documents": "generate_final_documents",
-            "end": END
-        }
-    )
+    # From human approval gate - only runs once the user has responded, never loops back
+    workflow.add_conditional_edges("human_approval", _route_from_approval, _APPROVAL_ROUTES)
     
     # From final document generation
     workflow.add_conditional_edges(
         "generate_final_documents",
         _route_from_final_documents,
-        {
-            "end": END,
-            "generate_final_documents": "generate_final_documents"  # Retry on error
-        }
+        _FINAL_DOCUMENTS_ROUTES
     )
     
     return workflow
 
 
-def _route_from_start(state: WorkflowGraphState) -> Literal[
-    "generate_requirements", "generate_design", "generate_tasks", 
-    "human_approval", "generate_final_documents", "end"
-]:
-    """Route from START based on current workflow state"""
-    
-    # Check for failure or completion first
-    if is_workflow_failed(state):
-        logger.info(f"Workflow {state['workflow_id']} failed, ending")
-        return "end"
+# Shared workflow graph; nodes, edges and routing never change at runtime
+_spec_workflow = None
+
+
+def get_spec_workflow() -> StateGraph:
+    """Get the shared spec workflow graph, building it on first use"""
+    global _spec_workflow
+    if _spec_workflow is None:
+        _spec_workflow = create_spec_workflow()
+    return _spec_workflow
+
+
+# Nodes that jump to final document generation once every phase is approved
+_FINAL_DOCUMENT_SOURCES = frozenset({"human_approval"})
+
+# Next node for each (source node, workflow status); anything missing ends the run
+_ROUTE_TABLE: Dict[Tuple[str, WorkflowStatus], str] = {
+    ("generate_requirements", WorkflowStatus.AWAITING_REQUIREMENTS_APPROVAL): "human_approval",
+    ("generate_design", WorkflowStatus.AWAITING_DESIGN_APPROVAL): "human_approval",
+    ("generate_tasks", WorkflowStatus.AWAITING_TASKS_APPROVAL): "human_approval",
+    # Transient errors are retried inside the nodes; the self-loop is only a last resort
+    ("generate_requirements", WorkflowStatus.REQUIRES_HARD_RETRY): "generate_requirements",
+    ("generate_design", WorkflowStatus.REQUIRES_HARD_RETRY): "generate_design",
+    ("generate_tasks", WorkflowStatus.REQUIRES_HARD_RETRY): "generate_tasks",
+    ("generate_final_documents", WorkflowStatus.REQUIRES_HARD_RETRY): "generate_final_documents",
+    # A rejected phase is absent: the workflow is cancelled and execution ends
+    ("human_approval", WorkflowStatus.GENERATING_REQUIREMENTS): "generate_requirements",
+    ("human_approval", WorkflowStatus.GENERATING_DESIGN): "generate_design",
+    ("human_approval", WorkflowStatus.GENERATING_TASKS): "generate_tasks",
+}
+
+
+# The only state fields routing depends on; hashable so route decisions can be cached
+_RoutingSnapshot = namedtuple(
+    "_RoutingSnapshot",
+    "status requirements_approved design_approved tasks_approved"
+)
+
+
+def _routing_snapshot(state: WorkflowGraphState) -> _RoutingSnapshot:
+    """Project the routing-relevant fields out of the workflow state"""
+    return _RoutingSnapshot(
+        state["status"],
+        bool(state["requirements_approved"]),
+        bool(state["design_approved"]),
+        bool(state["tasks_approved"])
+    )
+
+
+@lru_cache(maxsize=512)
+def _resolve_route(node: str, snapshot: _RoutingSnapshot) -> str:
+    """Pick the next node for a routing snapshot; the input space is small and fixed"""
+    status = snapshot.status
     
-    if is_workflow_complete(state):
-        logger.info(f"Workflow {state['workflow_id']} already complete, ending")
+    if status == WorkflowStatus.FAILED:
         return "end"
     
-    # Check if we should generate final documents
-    if should_generate_final_documents(state):
-        logger.info(f"Workflow {state['workflow_id']} ready for final document generation")
+    # Same condition as should_generate_final_documents, evaluated on the snapshot
+    if (
+        node in _FINAL_DOCUMENT_SOURCES
+        and status != WorkflowStatus.CANCELLED
+        and status != WorkflowStatus.COMPLETED
+        and snapshot.requirements_approved
+        and snapshot.design_approved
+        and snapshot.tasks_approved
+    ):
         return "generate_final_documents"
     
-    # Check if waiting for approval
-    if should_wait_for_approval(state):
-        logger.info(f"Workflow {state['workflow_id']} waiting for approval")
-        return "human_approval"
-    
-    # Check generation phases
-    if should_generate_requirements(state):
-        logger.info(f"Workflow {state['workflow_id']} generating requirements")
-        return "generate_requirements"
-    
-    if should_generate_design(state):
-        logger.info(f"Workflow {state['workflow_id']} generating design")
-        return "generate_design"
-    
-    if should_generate_tasks(state):
-        logger.info(f"Workflow {state['workflow_id']} generating tasks")
-        return "generate_tasks"
+    return _ROUTE_TABLE.get((node, status), "end")
+
+
+def _route(node: str, state: WorkflowGraphState) -> str:
+    """
+    Pick the next node after `node` from the routing table.
     
-    if state["status"] == WorkflowStatus.GENERATING_FINAL_DOCUMENTS:
-        logger.info(f"Workflow {state['workflow_id']} generating final documents")
-        return "generate_final_documents"
+    Args:
+        node: Name of the node that just ran
+        state: Current workflow state
+        
+    Returns:
+        Name of the next node, or "end"
+    """
     
-    # Default fallback
-    logger.warning(f"Workflow {state['workflow_id']} in unexpected state, ending")
-    return "end"
+    snapshot = _routing_snapshot(state)
+    route = _resolve_route(node, snapshot)
+    logger.debug("Workflow %s routing from %s to %s (%s)", state["workflow_id"], node, route, snapshot.status)
+    return route
 
 
 def _route_from_requirements(state: WorkflowGraphState) -> Literal[
     "human_approval", "generate_requirements", "end"
 ]:
     """Route from requirements generation"""
-    
-    if is_workflow_failed(state):
-        # Check if we should retry
-        if state["retry_count"] < 3:
-            logger.info(f"Retrying requirements generation for workflow {state['workflow_id']}")
-            return "generate_requirements"
-        else:
-            logger.error(f"Max retries reached for workflow {state['workflow_id']}")
-            return "end"
-    
-    if state["status"] == WorkflowStatus.AWAITING_REQUIREMENTS_APPROVAL:
-        return "human_approval"
-    
-    return "end"
+    return _route("generate_requirements", state)
 
 
 def _route_from_design(state: WorkflowGraphState) -> Literal[
     "human_approval", "generate_design", "end"
 ]:
     """Route from design generation"""
-    
-    if is_workflow_failed(state):
-        # Check if we should retry
-        if state["retry_count"] < 3:
-            logger.info(f"Retrying design generation for workflow {state['workflow_id']}")
-            return "generate_design"
-        else:
-            logger.error(f"Max retries reached for workflow {state['workflow_id']}")
-            return "end"
-    
-    if state["status"] == WorkflowStatus.AWAITING_DESIGN_APPROVAL:
-        return "human_approval"
-    
-    return "end"
+    return _route("generate_design", state)
 
 
 def _route_from_tasks(state: WorkflowGraphState) -> Literal[
     "human_approval", "generate_tasks", "end"
 ]:
     """Route from tasks generation"""
-    
-    if is_workflow_failed(state):
-        # Check if we should retry
-        if state["retry_count"] < 3:
-            logger.info(f"Retrying tasks generation for workflow {state['workflow_id']}")
-            return "generate_tasks"
-        else:
-            logger.error(f"Max retries reached for workflow {state['workflow_id']}")
-            return "end"
-    
-    if state["status"] == WorkflowStatus.AWAITING_TASKS_APPROVAL:
-        return "human_approval"
-    
-    return "end"
+    return _route("generate_tasks", state)
 
 
 def _route_from_approval(state: WorkflowGraphState) -> Literal[
     "generate_requirements", "generate_design", "generate_tasks",
-    "generate_final_documents", "human_approval", "end"
+    "generate_final_documents", "end"
 ]:
     """Route from human approval gate"""
-    
-    if is_workflow_failed(state) or state["status"] == WorkflowStatus.CANCELLED:
-        return "end"
-    
-    # Check if we should generate final documents
-    if should_generate_final_documents(state):
-        return "generate_final_documents"
-    
-    # If still waiting for approval, end the workflow execution
-    # The workflow will resume when user provides approval via API
-    if should_wait_for_approval(state):
-        logger.info(f"Workflow {state['workflow_id']} waiting for approval - ending execution until user input")
-        return "end"
-    
-    # Check what phase to generate next based on approvals and current phase
-    if state["status"] == WorkflowStatus.GENERATING_REQUIREMENTS:
-        return "generate_requirements"
-    
-    if state["status"] == WorkflowStatus.GENERATING_DESIGN:
-        return "generate_design"
-    
-    if state["status"] == WorkflowStatus.GENERATING_TASKS:
-        return "generate_tasks"
-    
-    return "end"
+    return _route("human_approval", state)
 
 
 def _route_from_final_documents(state: WorkflowGraphState) -> Literal["end", "generate_final_documents"]:
     """Route from final document generation"""
-    
-    if is_workflow_failed(state):
-        # Check if we should retry
-        if state["retry_count"] < 3:
-            logger.info(f"Retrying final document generation for workflow {state['workflow_id']}")
-            return "generate_final_documents"
-    
-    return "end"
+    return _route("generate_final_documents", state)
+
+
+@dataclass
+class CheckpointerConfig:
+    """Selects where workflow checkpoints are persisted"""
+    backend: str = "memory"  # "memory", "sqlite" or "postgres"
+    conn_string: Optional[str] = None
+    
+    @classmethod
+    def from_settings(cls) -> "CheckpointerConfig":
+        """Build the checkpointer configuration from application settings"""
+        return cls(
+            backend=settings.checkpointer_backend,
+            conn_string=settings.checkpointer_conn_string
+        )
 
 
 class SpecWorkflowManager:
     """High-level manager for spec generation workflows"""
     
-    def __init__(self):
-        """Initialize the workflow manager"""
-        self.workflow = create_spec_workflow()
+    def __init__(self, checkpointer_config: Optional[CheckpointerConfig] = None):
+        """
+        Initialize the workflow manager.
+        
+        Args:
+            checkpointer_config: Checkpoint storage selection (defaults to settings)
+        """
+        self.workflow = get_spec_workflow()
+        self.state_manager = get_state_manager()
+        self.checkpointer_config = checkpointer_config or CheckpointerConfig.from_settings()
+        
+        # Checkpointer and compiled graph are created lazily by setup(), since
+        # the persistent savers have to be opened inside the event loop
+        self.checkpointer = None
+        self.compiled_workflow = None
+        self._exit_stack: Optional[AsyncExitStack] = None
+        self._setup_lock: Optional[asyncio.Lock] = None
+        
+        logger.info(f"Spec workflow manager initialized ({self.checkpointer_config.backend} checkpointer)")
+    
+    async def setup(self) -> None:
+        """Open the configured checkpointer and compile the workflow graph"""
+        if self.compiled_workflow is not None:
+            return
+        
+        exit_stack = AsyncExitStack()
+        try:
+            self.checkpointer = await self._open_checkpointer(exit_stack)
+        except Exception:
+            await exit_stack.aclose()
+            raise
+        
+        self._exit_stack = exit_stack
+        
+        # Compile workflow with checkpointer for state persistence; execution
+        # suspends before the approval gate until the user responds
+        self.compiled_workflow = self.workflow.compile(
+            checkpointer=self.checkpointer,
+            interrupt_before=["human_approval"]
+        )
+        
+        logger.info(f"Compiled spec workflow with {self.checkpointer_config.backend} checkpointer")
+    
+    async def _open_checkpointer(self, exit_stack: AsyncExitStack):
+        """Create the checkpoint saver selected by the checkpointer configuration"""
+        backend = self.checkpointer_config.backend.lower()
+        conn_string = self.checkpointer_config.conn_string
+        
+        if backend == "memory":
+            return MemorySaver()
+        
+        if backend == "sqlite":
+            try:
+                from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+            except ImportError:
+                from langgraph.checkpoint.aiosqlite import AsyncSqliteSaver
+            saver_factory = AsyncSqliteSaver.from_conn_string(conn_string or ".specbot/spec_bot.db")
+        elif backend == "postgres":
+            from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+            if not conn_string:
+                raise ValueError("Postgres checkpointer requires a connection string")
+            saver_factory = AsyncPostgresSaver.from_conn_string(conn_string)
+        else:
+            raise ValueError(f"Unsupported checkpointer backend: {backend}")
+        
+        checkpointer = await exit_stack.enter_async_context(saver_factory)
+        
+        # Persistent savers create their tables on first use
+        if hasattr(checkpointer, "setup"):
+            await checkpointer.setup()
+        
+        # Serve checkpoints of active workflows from memory, write through to storage
+        return TieredCheckpointSaver(checkpointer, maxsize=settings.checkpoint_cache_size)
+    
+    async def _ensure_compiled(self) -> None:
+        """Run setup() once, even when several requests arrive concurrently"""
+        if self.compiled_workflow is not None:
+            return
+        
+        if self._setup_lock is None:
+            self._setup_lock = asyncio.Lock()
+        
+        async with self._setup_lock:
+            await self.setup()
+    
+    async def close(self) -> None:
+        """Dispose of the checkpointer and any connections it holds"""
+        if self._exit_stack is not None:
+            await self._exit_stack.aclose()
+            self._exit_stack = None
         
-        # Add memory for state persistence
-        self.checkpointer = MemorySaver()
-        # Compile workflow with checkpointer for state persistence
-        self.compiled_workflow = self.workflow.compile(checkpointer=self.checkpointer)
+        self.checkpointer = None
+        self.compiled_workflow = None
         
-        logger.info("Spec workflow manager initialized")
+        logger.info("Spec workflow manager closed")
     
     async def start_workflow(
         self,
@@ -321,32 +373,77 @@ class SpecWorkflowManager:
             Initial workflow state after first execution
         """
         
-        # Create initial state
-        state_manager = get_state_manager()
-        initial_state = state_manager.create_workflow_state(
-            workflow_id=workflow_id,
-            feature_name=feature_name,
-            description=description,
-            llm_provider=llm_provider,
-            model_name=model_name,
-            research_enabled=research_enabled
+        results = await self.start_workflows_batch([{
+            "workflow_id": workflow_id,
+            "feature_name": feature_name,
+            "description": description,
+            "llm_provider": llm_provider,
+            "model_name": model_name,
+            "research_enabled": research_enabled
+        }])
+        
+        result = results[0]
+        if isinstance(result, BaseException):
+            raise result
+        return result
+    
+    async def start_workflows_batch(
+        self,
+        workflow_requests: List[Dict[str, Any]],
+        concurrency_limit: Optional[int] = None
+    ) -> List[Union[WorkflowGraphState, BaseException]]:
+        """
+        Start several spec generation workflows concurrently.
+        
+        Args:
+            workflow_requests: Keyword arguments for start_workflow, one dict per workflow
+            concurrency_limit: Maximum workflows executing at once (defaults to settings)
+            
+        Returns:
+            Workflow state or raised exception for each request, in request order
+        """
+        
+        # Create every initial state up front, so each workflow can be looked up
+        # as soon as the batch starts, even while it waits for a free slot
+        initial_states = [
+            self.state_manager.create_workflow_state(**workflow_request)
+            for workflow_request in workflow_requests
+        ]
+        
+        await self._ensure_compiled()
+        
+        # Bound the number of in-flight LLM generations across the batch
+        semaphore = asyncio.Semaphore(concurrency_limit or settings.workflow_batch_concurrency)
+        
+        async def run_one(initial_state: WorkflowGraphState) -> WorkflowGraphState:
+            async with semaphore:
+                return await self._run_new_workflow(initial_state)
+        
+        return await asyncio.gather(
+            *(run_one(initial_state) for initial_state in initial_states),
+            return_exceptions=True
         )
+    
+    async def _run_new_workflow(self, initial_state: WorkflowGraphState) -> WorkflowGraphState:
+        """Run a newly created workflow to its first stop"""
+        
+        workflow_id = initial_state["workflow_id"]
         
         # Start workflow execution
         config = {"configurable": {"thread_id": workflow_id}}
         
         try:
             # Execute one step of the workflow
-            result = await self.compiled_workflow.ainvoke(initial_state, config)
+            result = await self._run_until_approval(workflow_id, initial_state, config)
             
-            logger.info(f"Started workflow {workflow_id} for feature: {feature_name}")
+            logger.info(f"Started workflow {workflow_id} for feature: {initial_state['feature_name']}")
             return result
             
         except Exception as e:
             logger.error(f"Error starting workflow {workflow_id}: {e}")
             
             # Update state with error
-            state_manager.update_workflow_state(
+            self.state_manager.update_workflow_state(
                 workflow_id,
                 {
                     "status": WorkflowStatus.FAILED,
@@ -366,17 +463,22 @@ class SpecWorkflowManager:
             Updated workflow state
         """
         
-        state_manager = get_state_manager()
-        current_state = state_manager.get_workflow_state(workflow_id)
+        current_state = await self.get_workflow_state(workflow_id)
         
         if not current_state:
             raise ValueError(f"Workflow {workflow_id} not found")
         
         config = {"configurable": {"thread_id": workflow_id}}
         
+        await self._ensure_compiled()
+        
+        snapshot = await self.compiled_workflow.aget_state(config)
+        if "human_approval" not in snapshot.next:
+            raise ValueError(f"Workflow {workflow_id} is not suspended at the approval gate")
+        
         try:
-            # Continue workflow execution
-            result = await self.compiled_workflow.ainvoke(current_state, config)
+            # Resume from the approval interrupt; the gate picks up the user's decision
+            result = await self._run_until_approval(workflow_id, None, config)
             
             logger.info(f"Continued workflow {workflow_id}")
             return result
@@ -385,7 +487,7 @@ class SpecWorkflowManager:
             logger.error(f"Error continuing workflow {workflow_id}: {e}")
             
             # Update state with error
-            state_manager.update_workflow_state(
+            self.state_manager.update_workflow_state(
                 workflow_id,
                 {
                     "status": WorkflowStatus.FAILED,
@@ -394,31 +496,131 @@ class SpecWorkflowManager:
             )
             raise
     
+    async def _run_until_approval(
+        self,
+        workflow_id: str,
+        graph_input: Optional[WorkflowGraphState],
+        config: Dict[str, Any]
+    ) -> WorkflowGraphState:
+        """
+        Stream graph execution and return as soon as a phase awaits approval.
+        
+        Args:
+            workflow_id: Workflow identifier
+            graph_input: Initial state, or None to resume from the checkpoint
+            config: Graph config with the workflow's thread id
+            
+        Returns:
+            Latest workflow state produced by the graph
+        """
+        
+        result = None
+        
+        # "updates" yields only what nodes return, so a resume never sees the
+        # checkpointed awaiting-approval state before the gate has run.
+        # "sync" durability writes each checkpoint before the next superstep starts;
+        # with the default "async", pending checkpoint writes pile up (each one holding
+        # the loop, channels and checkpoint dicts) while a slow saver catches up.
+        async for chunk in self.compiled_workflow.astream(
+            graph_input, config, stream_mode="updates", durability="sync"
+        ):
+            for node, update in chunk.items():
+                if not node.startswith("__") and update:
+                    result = update
+            
+            # The graph suspends before the gate anyway; don't wait for it to wind down
+            if result is not None and should_wait_for_approval(result):
+                start_speculative_generation(result)
+                break
+        
+        return result or self.state_manager.get_workflow_state(workflow_id)
+    
     async def get_workflow_state(self, workflow_id: str) -> Optional[WorkflowGraphState]:
-        """Get current workflow state"""
-        state_manager = get_state_manager()
-        return state_manager.get_workflow_state(workflow_id)
+        """
+        Get current workflow state, restoring it from the checkpointer if it isn't in memory.
+        
+        Workflows leave memory on restart and eviction, while persistent
+        checkpointers keep them.
+        
+        Args:
+            workflow_id: Workflow identifier
+            
+        Returns:
+            Workflow state, or None if the workflow is unknown
+        """
+        
+        state = self.state_manager.get_workflow_state(workflow_id)
+        if state is not None:
+            return state
+        
+        await self._ensure_compiled()
+        
+        snapshot = await self.compiled_workflow.aget_state({"configurable": {"thread_id": workflow_id}})
+        if not snapshot.values:
+            return None
+        
+        # Another request may have restored it while the checkpoint was loading
+        return (
+            self.state_manager.get_workflow_state(workflow_id)
+            or self.state_manager.restore_workflow_state(snapshot.values)
+        )
+    
+    async def delete_workflow(self, workflow_id: str) -> bool:
+        """
+        Delete a workflow's checkpoints and remove it from memory.
+        
+        Args:
+            workflow_id: Workflow to delete
+            
+        Returns:
+            True if the workflow was in memory, False otherwise
+        """
+        
+        await self._ensure_compiled()
+        
+        # Otherwise the next lookup would restore it from the checkpointer
+        await self.checkpointer.adelete_thread(workflow_id)
+        
+        return self.state_manager.cleanup_workflow(workflow_id)
     
-    def get_workflow_history(self, workflow_id: str) -> List[Dict[str, Any]]:
-        """Get workflow execution history"""
+    async def get_workflow_history(
+        self,
+        workflow_id: str,
+        limit: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over workflow execution history, most recent first.
+        
+        Snapshots are yielded one at a time so only the current snapshot's
+        documents are held in memory.
+        
+        Args:
+            workflow_id: Workflow identifier
+            limit: Maximum number of history entries to yield
+            
+        Yields:
+            One summary dict per checkpoint
+        """
         config = {"configurable": {"thread_id": workflow_id}}
         
+        if limit == 0:
+            return
+        
+        await self._ensure_compiled()
+        
         try:
             # Get state history from checkpointer
-            history = []
-            for state in self.compiled_workflow.get_state_history(config):
-                history.append({
+            async for state in self.compiled_workflow.aget_state_history(config, limit=limit):
+                yield {
                     "timestamp": state.created_at,
                     "status": state.values.get("status"),
                     "phase": state.values.get("current_phase"),
                     "node": state.metadata.get("source", "unknown")
-                })
-            
-            return history
+                }
             
         except Exception as e:
             logger.error(f"Error getting workflow history for {workflow_id}: {e}")
-            return []
+            raise
 
 
 # Global workflow manager instance
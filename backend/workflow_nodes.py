@@ -4,17 +4,61 @@ Each node represents a step in the workflow that processes the state and perform
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+import random
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Any, List, Optional, Tuple
 import asyncio
 
-from workflow_state import WorkflowGraphState, WorkflowStatus, get_state_manager
-from llm_client import LLMMessage, get_llm_client, LLMError
+from workflow_state import WorkflowGraphState, WorkflowStatus, AWAITING_APPROVAL_STATUSES, get_state_manager
+from llm_client import (
+    LLMMessage,
+    LLMClient,
+    get_llm_client,
+    LLMError,
+    RateLimitError,
+    ServiceUnavailableError,
+    AuthenticationError,
+    ModelNotFoundError,
+    CircuitOpenError,
+    get_circuit_breaker
+)
 from llm_utils import generate_and_parse, ParseResult, ParseMode
-from template_renderer import SpecRenderer
+from template_renderer import get_spec_renderer
+from file_manager import get_file_manager
 from models import SpecState, WorkflowPhase
+from config import settings
 
 logger = logging.getLogger(__name__)
 
+# Attempts made for a single LLM call before the node gives up on it
+LLM_CALL_ATTEMPTS = 3
+
+# Upper bound in seconds for the exponential backoff between LLM attempts
+LLM_RETRY_MAX_DELAY = 30
+
+# Graph-level re-runs of a node allowed after its in-node retries are exhausted
+MAX_NODE_RETRIES = 3
+
+# Errors that will fail the same way however many times the node is re-run
+_PERMANENT_ERRORS = (AuthenticationError, ModelNotFoundError)
+
+# Errors that fail the node without a re-run: an open circuit would fail every
+# re-run at once and spend the whole retry budget while the provider is down
+_NO_RETRY_ERRORS = _PERMANENT_ERRORS + (CircuitOpenError,)
+
+# Errors retried in place, since the next attempt may well succeed
+_TRANSIENT_ERRORS = (RateLimitError, ServiceUnavailableError)
+
+# LLM clients own an HTTP connection pool; reuse one per provider and model
+# instead of paying client construction and a TLS handshake on every node run
+_get_cached_llm_client = lru_cache(maxsize=16)(get_llm_client)
+
+# Shared cap on in-flight LLM calls; created lazily so it binds to the server's event loop
+_llm_semaphore: Optional[asyncio.Semaphore] = None
+
 
 # Prompts for each generation phase
 REQUIREMENTS_SYSTEM_PROMPT = """You are an expert business analyst and requirements engineer. Your task is to generate comprehensive, well-structured requirements documentation for software features.
@@ -54,6 +98,9 @@ Given a feature description, you should:
 
 Continue this pattern for all functional requirements. Each requirement must have a User Story and Acceptance Criteria. Business Rules, Dependencies, and Assumptions are optional but should be included when relevant."""
 
+# Recorded with generated messages instead of the prompt text; bump when the prompt changes
+REQUIREMENTS_SYSTEM_PROMPT_ID = "requirements_v1"
+
 DESIGN_SYSTEM_PROMPT = """You are a senior software architect and system designer. Your task is to create comprehensive technical design documentation based on established requirements.
 
 Given feature requirements, you should:
@@ -132,6 +179,8 @@ Given feature requirements, you should:
 
 Structure your entire response following this exact format. Include real technical details, code examples, and architectural diagrams using ASCII art."""
 
+DESIGN_SYSTEM_PROMPT_ID = "design_v1"
+
 TASKS_SYSTEM_PROMPT = """You are an experienced project manager and software development lead. Your task is to create detailed implementation plans based on requirements and design specifications.
 
 Given requirements and design documents, you should:
@@ -164,6 +213,22 @@ Brief description of this phase.
 
 Continue this pattern for all phases. Each phase must use "### Phase" headers and tasks must be in the table format shown above."""
 
+TASKS_SYSTEM_PROMPT_ID = "tasks_v1"
+
+# Fixed parts of the design and tasks user prompts, joined around the per-workflow context
+DESIGN_USER_PROMPT_HEADER = "Please generate comprehensive technical design documentation based on the following information:"
+
+DESIGN_USER_PROMPT_INSTRUCTIONS = """**CRITICAL TECHNOLOGY CONSTRAINT**: If the feature description or requirements specify a particular technology stack (e.g., .NET, React, Azure SQL Database, etc.), you MUST design the solution using EXACTLY those technologies. Do not substitute with alternatives like PostgreSQL, Node.js, or other technologies not specified.
+
+Create a detailed design document that addresses architecture, data models, API design, user interface, security, performance, and implementation considerations. The design should be practical and implementable based on the requirements using the specified technology stack."""
+
+TASKS_USER_PROMPT_HEADER = "Please generate a comprehensive implementation plan based on the following information:"
+
+TASKS_USER_PROMPT_INSTRUCTIONS = "Create a detailed implementation plan that breaks down the work into phases and specific tasks. Include estimates, dependencies, resource requirements, quality assurance processes, and success metrics. The plan should be actionable and guide a development team through the implementation."
+
+# System prompts are identical across calls; ask providers that support it to cache their prefill
+SYSTEM_PROMPT_CACHE_CONTROL = {"type": "ephemeral"}
+
 
 async def generate_requirements_node(state: WorkflowGraphState) -> WorkflowGraphState:
     """
@@ -176,19 +241,21 @@ async def generate_requirements_node(state: WorkflowGraphState) -> WorkflowGraph
         Updated workflow state with generated requirements
     """
     
-    logger.info(f"Generating requirements for workflow {state['workflow_id']}")
+    workflow_id = state["workflow_id"]
+    
+    logger.info("Generating requirements for workflow %s", workflow_id)
     
     try:
         # Update state to show we're generating
         state_manager = get_state_manager()
         state = state_manager.update_workflow_state(
-            state["workflow_id"],
+            workflow_id,
             {"status": WorkflowStatus.GENERATING_REQUIREMENTS}
         )
         
         # Prepare messages for LLM
         messages = [
-            LLMMessage(role="system", content=REQUIREMENTS_SYSTEM_PROMPT),
+            LLMMessage(role="system", content=REQUIREMENTS_SYSTEM_PROMPT, cache_control=SYSTEM_PROMPT_CACHE_CONTROL),
             LLMMessage(
                 role="user", 
                 content=f"""Please generate comprehensive requirements documentation for the following feature:
@@ -206,43 +273,35 @@ Please provide a detailed requirements document that covers all aspects of this
         ]
         
         # Get LLM client
-        llm_client = get_llm_client(
+        llm_client = _get_cached_llm_client(
             provider=state["llm_provider"],
             model_name=state["model_name"]
         )
         
         # Generate requirements
-        response = await llm_client.generate(messages)
-        requirements_content = response.content
-        
-        # Add to conversation history
-        state_manager.add_conversation_message(
-            state["workflow_id"],
-            "assistant",
-            requirements_content,
-            {"phase": "requirements", "model": state["model_name"]}
-        )
+        requirements_content = await _stream_with_retry(llm_client, messages, workflow_id, "requirements")
         
-        # Set pending approval
+        # Record the response and set pending approval in one state update
         state = state_manager.set_pending_approval(
-            state["workflow_id"],
+            workflow_id,
             "requirements",
-            requirements_content
+            requirements_content,
+            message_metadata={
+                "phase": "requirements",
+                "model": state["model_name"],
+                "system_prompt_id": REQUIREMENTS_SYSTEM_PROMPT_ID
+            }
         )
         
-        logger.info(f"Generated requirements for workflow {state['workflow_id']}")
+        logger.info("Generated requirements for workflow %s", workflow_id)
         
     except Exception as e:
-        logger.error(f"Error generating requirements for workflow {state['workflow_id']}: {e}")
+        logger.error("Error generating requirements for workflow %s: %s", workflow_id, e)
         
         # Update state with error
         state = state_manager.update_workflow_state(
-            state["workflow_id"],
-            {
-                "status": WorkflowStatus.FAILED,
-                "last_error": str(e),
-                "retry_count": state["retry_count"] + 1
-            }
+            workflow_id,
+            _failure_updates(state, e)
         )
     
     return state
@@ -259,86 +318,54 @@ async def generate_design_node(state: WorkflowGraphState) -> WorkflowGraphState:
         Updated workflow state with generated design
     """
     
-    logger.info(f"Generating design for workflow {state['workflow_id']}")
+    workflow_id = state["workflow_id"]
+    
+    logger.info("Generating design for workflow %s", workflow_id)
     
     try:
         # Update state to show we're generating
         state_manager = get_state_manager()
         state = state_manager.update_workflow_state(
-            state["workflow_id"],
+            workflow_id,
             {"status": WorkflowStatus.GENERATING_DESIGN}
         )
         
         # Prepare messages for LLM, including requirements context
-        context_parts = [
-            f"**Feature Name:** {state['feature_name']}",
-            f"**Description:** {state['initial_description']}"
-        ]
-        
-        # Include requirements if available
-        if state["requirements_content"]:
-            context_parts.append(f"**Requirements Document:**\n{state['requirements_content']}")
-        
-        # Include user feedback if revising
-        if state["user_feedback"]:
-            context_parts.append(f"**User Feedback:** {state['user_feedback']}")
-        
-        context = "\n\n".join(context_parts)
-        
-        messages = [
-            LLMMessage(role="system", content=DESIGN_SYSTEM_PROMPT),
-            LLMMessage(
-                role="user",
-                content=f"""Please generate comprehensive technical design documentation based on the following information:
-
-{context}
-
-{_build_context_from_conversation(state)}
-
-**CRITICAL TECHNOLOGY CONSTRAINT**: If the feature description or requirements specify a particular technology stack (e.g., .NET, React, Azure SQL Database, etc.), you MUST design the solution using EXACTLY those technologies. Do not substitute with alternatives like PostgreSQL, Node.js, or other technologies not specified.
-
-Create a detailed design document that addresses architecture, data models, API design, user interface, security, performance, and implementation considerations. The design should be practical and implementable based on the requirements using the specified technology stack."""
-            )
-        ]
+        messages = _design_messages(state)
         
         # Get LLM client
-        llm_client = get_llm_client(
+        llm_client = _get_cached_llm_client(
             provider=state["llm_provider"],
             model_name=state["model_name"]
         )
         
         # Generate design
-        response = await llm_client.generate(messages)
-        design_content = response.content
-        
-        # Add to conversation history
-        state_manager.add_conversation_message(
-            state["workflow_id"],
-            "assistant",
-            design_content,
-            {"phase": "design", "model": state["model_name"]}
-        )
+        # Use the draft made while the previous phase was reviewed, if its prompt still matches
+        design_content = await _take_speculative_draft(workflow_id, "design", messages)
+        if design_content is None:
+            design_content = await _stream_with_retry(llm_client, messages, workflow_id, "design")
         
-        # Set pending approval
+        # Record the response and set pending approval in one state update
         state = state_manager.set_pending_approval(
-            state["workflow_id"],
-            "design", 
-            design_content
+            workflow_id,
+            "design",
+            design_content,
+            message_metadata={
+                "phase": "design",
+                "model": state["model_name"],
+                "system_prompt_id": DESIGN_SYSTEM_PROMPT_ID
+            }
         )
         
-        logger.info(f"Generated design for workflow {state['workflow_id']}")
+        logger.info("Generated design for workflow %s", workflow_id)
         
     except Exception as e:
-        logger.error(f"Error generating design for workflow {state['workflow_id']}: {e}")
+        logger.error("Error generating design for workflow %s: %s", workflow_id, e)
         
         # Update state with error
         state = state_manager.update_workflow_state(
-            state["workflow_id"],
-            {
-                "status": WorkflowStatus.FAILED,
-                "last_error": str(e),
-                "retry_count": state["retry_count"] + 1
-            }
+            workflow_id,
+            _failure_updates(state, e)
         )
     
     return state
@@ -355,88 +382,54 @@ async def generate_tasks_node(state: WorkflowGraphState) -> WorkflowGraphState:
         Updated workflow state with generated tasks
     """
     
-    logger.info(f"Generating tasks for workflow {state['workflow_id']}")
+    workflow_id = state["workflow_id"]
+    
+    logger.info("Generating tasks for workflow %s", workflow_id)
     
     try:
         # Update state to show we're generating
         state_manager = get_state_manager()
         state = state_manager.update_workflow_state(
-            state["workflow_id"],
+            workflow_id,
             {"status": WorkflowStatus.GENERATING_TASKS}
         )
         
         # Prepare messages for LLM, including requirements and design context
-        context_parts = [
-            f"**Feature Name:** {state['feature_name']}",
-            f"**Description:** {state['initial_description']}"
-        ]
-        
-        # Include requirements if available
-        if state["requirements_content"]:
-            context_parts.append(f"**Requirements Document:**\n{state['requirements_content']}")
-        
-        # Include design if available
-        if state["design_content"]:
-            context_parts.append(f"**Design Document:**\n{state['design_content']}")
-        
-        # Include user feedback if revising
-        if state["user_feedback"]:
-            context_parts.append(f"**User Feedback:** {state['user_feedback']}")
-        
-        context = "\n\n".join(context_parts)
-        
-        messages = [
-            LLMMessage(role="system", content=TASKS_SYSTEM_PROMPT),
-            LLMMessage(
-                role="user",
-                content=f"""Please generate a comprehensive implementation plan based on the following information:
-
-{context}
-
-{_build_context_from_conversation(state)}
-
-Create a detailed implementation plan that breaks down the work into phases and specific tasks. Include estimates, dependencies, resource requirements, quality assurance processes, and success metrics. The plan should be actionable and guide a development team through the implementation."""
-            )
-        ]
+        messages = _tasks_messages(state)
         
         # Get LLM client
-        llm_client = get_llm_client(
+        llm_client = _get_cached_llm_client(
             provider=state["llm_provider"],
             model_name=state["model_name"]
         )
         
         # Generate tasks
-        response = await llm_client.generate(messages)
-        tasks_content = response.content
-        
-        # Add to conversation history
-        state_manager.add_conversation_message(
-            state["workflow_id"],
-            "assistant",
-            tasks_content,
-            {"phase": "tasks", "model": state["model_name"]}
-        )
+        # Use the draft made while the previous phase was reviewed, if its prompt still matches
+        tasks_content = await _take_speculative_draft(workflow_id, "tasks", messages)
+        if tasks_content is None:
+            tasks_content = await _stream_with_retry(llm_client, messages, workflow_id, "tasks")
         
-        # Set pending approval
+        # Record the response and set pending approval in one state update
         state = state_manager.set_pending_approval(
-            state["workflow_id"],
+            workflow_id,
             "tasks",
-            tasks_content
+            tasks_content,
+            message_metadata={
+                "phase": "tasks",
+                "model": state["model_name"],
+                "system_prompt_id": TASKS_SYSTEM_PROMPT_ID
+            }
         )
         
-        logger.info(f"Generated tasks for workflow {state['workflow_id']}")
+        logger.info("Generated tasks for workflow %s", workflow_id)
         
     except Exception as e:
-        logger.error(f"Error generating tasks for workflow {state['workflow_id']}: {e}")
+        logger.error("Error generating tasks for workflow %s: %s", workflow_id, e)
         
         # Update state with error
         state = state_manager.update_workflow_state(
-            state["workflow_id"],
-            {
-                "status": WorkflowStatus.FAILED,
-                "last_error": str(e),
-                "retry_count": state["retry_count"] + 1
-            }
+            workflow_id,
+            _failure_updates(state, e)
         )
     
     return state
@@ -444,21 +437,28 @@ Create a detailed implementation plan that breaks down the work into phases and
 
 async def human_approval_gate_node(state: WorkflowGraphState) -> WorkflowGraphState:
     """
-    Human approval gate - waits for user input before proceeding.
-    This node doesn't modify the state but serves as a checkpoint.
+    Human approval gate - runs when the workflow resumes after user input.
+    The graph is interrupted before this node; the approval itself is recorded
+    through the API, so the node picks up the decision from the state manager.
     
     Args:
-        state: Current workflow state
+        state: Workflow state checkpointed at the interrupt
         
     Returns:
-        Unmodified workflow state (user interaction happens externally)
+        Workflow state including the user's approval decision
     """
     
-    logger.info(f"Workflow {state['workflow_id']} waiting for human approval")
+    workflow_id = state["workflow_id"]
+    
+    logger.info("Workflow %s resuming after human approval", workflow_id)
     
-    # In a real implementation, this would trigger notifications to the user
-    # For now, we just log and return the state unchanged
-    # The actual approval handling happens through API endpoints
+    state_manager = get_state_manager()
+    state = state_manager.get_workflow_state(workflow_id) or state
+    
+    # A draft of the next phase is only useful if the user approved this one
+    draft = _speculative_drafts.get(workflow_id)
+    if draft is not None and state["status"] != _DRAFT_GENERATING_STATUS[draft[0]]:
+        discard_speculative_draft(workflow_id)
     
     return state
 
@@ -474,7 +474,9 @@ async def generate_final_documents_node(state: WorkflowGraphState) -> WorkflowGr
         Updated workflow state with generated files
     """
     
-    logger.info(f"Generating final documents for workflow {state['workflow_id']}")
+    workflow_id = state["workflow_id"]
+    
+    logger.info("Generating final documents for workflow %s", workflow_id)
     
     try:
         state_manager = get_state_manager()
@@ -482,50 +484,330 @@ async def generate_final_documents_node(state: WorkflowGraphState) -> WorkflowGr
         # Convert to SpecState for template rendering
         spec_state = state_manager.convert_to_spec_state(state)
         
-        # Render all documents
-        renderer = SpecRenderer()
-        documents = renderer.render_all_documents(spec_state)
+        # Render all documents in a worker thread so template rendering doesn't block the loop
+        renderer = get_spec_renderer()
+        documents = await asyncio.to_thread(renderer.render_all_documents, spec_state)
         
         # Write files to disk using FileManager
-        from file_manager import FileManager
-        file_manager = FileManager()
+        file_manager = get_file_manager()
         
-        written_files = file_manager.write_specification_files(
-            workflow_id=state["workflow_id"],
+        written_files = await file_manager.awrite_specification_files(
+            workflow_id=workflow_id,
             feature_name=spec_state.feature_name,
             files=documents
         )
         
-        logger.info(f"Successfully wrote {len(written_files)} files to disk:")
-        for filename, path in written_files.items():
-            logger.info(f"  {filename} -> {path}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Successfully wrote %s files to disk:", len(written_files))
+            for filename, path in written_files.items():
+                logger.info("  %s -> %s", filename, path)
         
-        # Update state with generated files and file paths
+        # Update state with generated files and file paths; once on disk the
+        # documents are read back from the files instead of kept in memory
         state = state_manager.update_workflow_state(
-            state["workflow_id"],
+            workflow_id,
             {
-                "generated_files": documents,
+                "generated_files": documents if state_manager.retain_payloads else {},
                 "written_file_paths": written_files,
                 "status": WorkflowStatus.COMPLETED
             }
         )
         
-        logger.info(f"Generated and wrote {len(documents)} final documents for workflow {state['workflow_id']}")
+        logger.info("Generated and wrote %s final documents for workflow %s", len(documents), workflow_id)
         
     except Exception as e:
-        logger.error(f"Error generating final documents for workflow {state['workflow_id']}: {e}")
+        logger.error("Error generating final documents for workflow %s: %s", workflow_id, e)
         
         state = state_manager.update_workflow_state(
-            state["workflow_id"],
-            {
-                "status": WorkflowStatus.FAILED,
-                "last_error": str(e)
-            }
+            workflow_id,
+            _failure_updates(state, e)
         )
     
     return state
 
 
+def _design_messages(state: WorkflowGraphState) -> List[LLMMessage]:
+    """Build the design generation prompt for a workflow state"""
+    
+    # Joined once from its parts so the phase documents aren't copied repeatedly
+    prompt_parts = [
+        DESIGN_USER_PROMPT_HEADER,
+        f"**Feature Name:** {state['feature_name']}",
+        f"**Description:** {state['initial_description']}"
+    ]
+    
+    # Include requirements if available
+    if state["requirements_content"]:
+        prompt_parts.append(f"**Requirements Document:**\n{state['requirements_content']}")
+    
+    # Include user feedback if revising
+    if state["user_feedback"]:
+        prompt_parts.append(f"**User Feedback:** {state['user_feedback']}")
+    
+    prompt_parts.append(_build_context_from_conversation(state))
+    prompt_parts.append(DESIGN_USER_PROMPT_INSTRUCTIONS)
+    
+    return [
+        LLMMessage(role="system", content=DESIGN_SYSTEM_PROMPT, cache_control=SYSTEM_PROMPT_CACHE_CONTROL),
+        LLMMessage(role="user", content="\n\n".join(prompt_parts))
+    ]
+
+
+def _tasks_messages(state: WorkflowGraphState) -> List[LLMMessage]:
+    """Build the tasks generation prompt for a workflow state"""
+    
+    # Joined once from its parts so the phase documents aren't copied repeatedly
+    prompt_parts = [
+        TASKS_USER_PROMPT_HEADER,
+        f"**Feature Name:** {state['feature_name']}",
+        f"**Description:** {state['initial_description']}"
+    ]
+    
+    # Include requirements if available
+    if state["requirements_content"]:
+        prompt_parts.append(f"**Requirements Document:**\n{state['requirements_content']}")
+    
+    # Include design if available
+    if state["design_content"]:
+        prompt_parts.append(f"**Design Document:**\n{state['design_content']}")
+    
+    # Include user feedback if revising
+    if state["user_feedback"]:
+        prompt_parts.append(f"**User Feedback:** {state['user_feedback']}")
+    
+    prompt_parts.append(_build_context_from_conversation(state))
+    prompt_parts.append(TASKS_USER_PROMPT_INSTRUCTIONS)
+    
+    return [
+        LLMMessage(role="system", content=TASKS_SYSTEM_PROMPT, cache_control=SYSTEM_PROMPT_CACHE_CONTROL),
+        LLMMessage(role="user", content="\n\n".join(prompt_parts))
+    ]
+
+
+
+# Drafts of the next phase generated while the user reviews the current one,
+# oldest first: workflow_id -> (phase, prompt messages, generation task, monotonic start time)
+_speculative_drafts: "OrderedDict[str, Tuple[str, List[LLMMessage], asyncio.Task[Optional[str]], float]]" = OrderedDict()
+
+# Phase drafted while each approval is pending, with its prompt builder
+_SPECULATIVE_PHASES = {
+    WorkflowStatus.AWAITING_REQUIREMENTS_APPROVAL: ("design", _design_messages),
+    WorkflowStatus.AWAITING_DESIGN_APPROVAL: ("tasks", _tasks_messages)
+}
+
+# Status the workflow moves to when the drafted phase is approved for generation
+_DRAFT_GENERATING_STATUS = {
+    "design": WorkflowStatus.GENERATING_DESIGN,
+    "tasks": WorkflowStatus.GENERATING_TASKS
+}
+
+
+def start_speculative_generation(state: WorkflowGraphState) -> None:
+    """
+    Start drafting the next phase while the user reviews the current one.
+    
+    The draft is generated from the state an approval without feedback would
+    produce and is only used if the real prompt turns out identical. Disabled
+    unless SPECULATIVE_GENERATION is set, since every revision or rejection
+    wastes the drafted generation.
+    
+    Args:
+        state: Workflow state awaiting approval
+    """
+    
+    if not settings.speculative_generation:
+        return
+    
+    next_phase = _SPECULATIVE_PHASES.get(state["status"])
+    if next_phase is None:
+        return
+    
+    phase, build_messages = next_phase
+    workflow_id = state["workflow_id"]
+    discard_speculative_draft(workflow_id)
+    _expire_speculative_drafts()
+    
+    try:
+        messages = build_messages({**state, "user_feedback": None})
+        llm_client = _get_cached_llm_client(
+            provider=state["llm_provider"],
+            model_name=state["model_name"]
+        )
+    except Exception as e:
+        logger.warning("Could not start speculative %s draft for workflow %s: %s", phase, workflow_id, e)
+        return
+    
+    task = asyncio.create_task(_generate_draft(llm_client, messages, workflow_id, phase))
+    _speculative_drafts[workflow_id] = (phase, messages, task, time.monotonic())
+    
+    logger.info("Started speculative %s draft for workflow %s", phase, workflow_id)
+
+
+def discard_speculative_draft(workflow_id: str) -> None:
+    """Cancel and forget a workflow's speculative draft, if any"""
+    draft = _speculative_drafts.pop(workflow_id, None)
+    if draft is not None:
+        draft[2].cancel()
+
+
+def _expire_speculative_drafts() -> None:
+    """
+    Discard drafts older than the state manager's TTL, and the oldest ones while
+    its workflow capacity is reached.
+    
+    Workflows left awaiting approval are never evicted from the state manager,
+    so their drafts are bounded here instead.
+    """
+    state_manager = get_state_manager()
+    cutoff = time.monotonic() - state_manager.ttl_seconds
+    
+    while _speculative_drafts:
+        workflow_id, draft = next(iter(_speculative_drafts.items()))
+        if draft[3] >= cutoff and len(_speculative_drafts) < state_manager.max_workflows:
+            break
+        
+        discard_speculative_draft(workflow_id)
+        logger.info("Discarded expired speculative %s draft for workflow %s", draft[0], workflow_id)
+
+
+async def _generate_draft(
+    llm_client: LLMClient,
+    messages: List[LLMMessage],
+    workflow_id: str,
+    phase: str
+) -> Optional[str]:
+    """Generate a speculative draft; failures only mean the phase is generated normally"""
+    try:
+        async with _get_llm_semaphore():
+            response = await llm_client.generate(messages)
+        return response.content or None
+    except Exception as e:
+        logger.warning("Speculative %s draft failed for workflow %s: %s", phase, workflow_id, e)
+        return None
+
+
+async def _take_speculative_draft(workflow_id: str, phase: str, messages: List[LLMMessage]) -> Optional[str]:
+    """
+    Claim the speculative draft for a phase if it was generated from exactly this prompt.
+    
+    A draft still in flight is awaited, since it started before the user approved.
+    
+    Returns:
+        Draft content, or None if the phase has to be generated now
+    """
+    
+    draft = _speculative_drafts.pop(workflow_id, None)
+    if draft is None:
+        return None
+    
+    draft_phase, draft_messages, task, _ = draft
+    if draft_phase != phase or draft_messages != messages:
+        task.cancel()
+        return None
+    
+    content = await task
+    if content:
+        logger.info("Using speculative %s draft for workflow %s", phase, workflow_id)
+    return content
+
+
+async def _stream_with_retry(
+    llm_client: LLMClient,
+    messages: List[LLMMessage],
+    workflow_id: str,
+    phase: str
+) -> str:
+    """
+    Stream phase content from the LLM, retrying transient errors in place with jittered backoff.
+    
+    Chunks are published to the state manager as they arrive, so status polls
+    can show the document while it is being written. Retrying inside the node
+    avoids a graph transition and checkpoint write for every transient failure.
+    
+    Args:
+        llm_client: Client to generate with
+        messages: Prompt messages
+        workflow_id: Workflow the content is generated for
+        phase: Phase being generated (requirements, design, tasks)
+        
+    Returns:
+        Complete content from the first successful attempt
+    """
+    
+    state_manager = get_state_manager()
+    circuit_breaker = get_circuit_breaker(llm_client.provider)
+    
+    try:
+        for attempt in range(1, LLM_CALL_ATTEMPTS + 1):
+            chunks = []
+            state_manager.clear_streaming_content(workflow_id)
+            
+            # Fail fast instead of waiting out timeouts while the provider is down
+            circuit_breaker.before_call()
+            
+            try:
+                # Only the call itself holds a slot, so backoff sleeps don't block other workflows
+                async with _get_llm_semaphore():
+                    async for chunk in llm_client.stream(messages):
+                        chunks.append(chunk)
+                        state_manager.append_streaming_chunk(workflow_id, phase, chunk)
+            except _TRANSIENT_ERRORS as e:
+                if isinstance(e, ServiceUnavailableError):
+                    circuit_breaker.record_failure()
+                if attempt == LLM_CALL_ATTEMPTS:
+                    raise
+                
+                # Jitter keeps workflows that failed together from retrying in lockstep
+                delay = min(2 ** (attempt - 1), LLM_RETRY_MAX_DELAY) + random.random()
+                logger.warning("LLM call failed (attempt %s/%s), retrying in %.1fs: %s", attempt, LLM_CALL_ATTEMPTS, delay, e)
+                await asyncio.sleep(delay)
+                continue
+            
+            circuit_breaker.record_success()
+            
+            content = "".join(chunks)
+            if not content:
+                raise LLMError(f"Empty {phase} response from LLM")
+            return content
+    finally:
+        state_manager.clear_streaming_content(workflow_id)
+
+
+def _get_llm_semaphore() -> asyncio.Semaphore:
+    """Get the semaphore limiting concurrent LLM calls across workflows"""
+    global _llm_semaphore
+    if _llm_semaphore is None:
+        _llm_semaphore = asyncio.Semaphore(settings.llm_max_concurrency)
+    return _llm_semaphore
+
+
+def _failure_updates(state: WorkflowGraphState, error: Exception) -> Dict[str, Any]:
+    """
+    Build the state updates for a node that failed with `error`.
+    
+    The workflow is marked REQUIRES_HARD_RETRY, which re-runs the node, only
+    while the node retry budget lasts and the error is not permanent or an
+    open circuit; otherwise it is marked FAILED.
+    """
+    
+    retry_count = state["retry_count"] + 1
+    
+    if isinstance(error, _NO_RETRY_ERRORS):
+        status = WorkflowStatus.FAILED
+    elif retry_count < MAX_NODE_RETRIES:
+        logger.info("Retrying failed node for workflow %s (%s/%s)", state["workflow_id"], retry_count, MAX_NODE_RETRIES)
+        status = WorkflowStatus.REQUIRES_HARD_RETRY
+    else:
+        logger.error("Max retries reached for workflow %s", state["workflow_id"])
+        status = WorkflowStatus.FAILED
+    
+    return {
+        "status": status,
+        "last_error": str(error),
+        "retry_count": retry_count
+    }
+
+
 def _build_context_from_conversation(state: WorkflowGraphState) -> str:
     """
     Build additional context from conversation history for LLM prompts.
@@ -537,27 +819,34 @@ def _build_context_from_conversation(state: WorkflowGraphState) -> str:
         Formatted conversation context
     """
     
-    if not state["conversation_history"]:
+    # Missing count means state from before the counter existed; fall back to scanning
+    if not state["conversation_history"] or state.get("user_message_count") == 0:
         return ""
     
-    # Get recent relevant messages (last 5 user messages)
-    user_messages = [
-        msg for msg in state["conversation_history"][-10:]
-        if msg["role"] == "user"
-    ]
+    # Last 3 user messages among the 10 most recent, found by walking backwards
+    # so the history is neither copied nor fully scanned
+    user_messages = []
+    for msg in islice(reversed(state["conversation_history"]), 10):
+        if msg["role"] == "user":
+            user_messages.append(msg)
+            if len(user_messages) == 3:
+                break
     
     if not user_messages:
         return ""
     
+    user_messages.reverse()
     context_parts = ["**Additional Context from Conversation:**"]
     
-    for i, msg in enumerate(user_messages[-3:], 1):  # Last 3 user messages
+    for i, msg in enumerate(user_messages, 1):
         context_parts.append(f"{i}. {msg['content'][:200]}{'...' if len(msg['content']) > 200 else ''}")
     
     return "\n".join(context_parts)
 
 
-# Node routing functions
+# Workflow state predicates
+# The graph itself routes with the (node, status) table in workflow.py; these
+# are single-lookup checks for callers that need to inspect a state
 
 def should_generate_requirements(state: WorkflowGraphState) -> bool:
     """Check if we should generate requirements"""
@@ -579,11 +868,7 @@ def should_generate_tasks(state: WorkflowGraphState) -> bool:
 
 def should_wait_for_approval(state: WorkflowGraphState) -> bool:
     """Check if we should wait for human approval"""
-    return state["status"] in [
-        WorkflowStatus.AWAITING_REQUIREMENTS_APPROVAL,
-        WorkflowStatus.AWAITING_DESIGN_APPROVAL,
-        WorkflowStatus.AWAITING_TASKS_APPROVAL
-    ]
+    return state["status"] in AWAITING_APPROVAL_STATUSES
 
 
 def should_generate_final_documents(state: WorkflowGraphState) -> bool:
@@ -4,15 +4,37 @@ Handles state transitions, phase tracking, and persistence across workflow execu
 """
 
 import logging
-from typing import Dict, Any, Optional, List, TypedDict, Annotated
-from datetime import datetime
+import sys
+import time
+from copy import deepcopy
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple, TypedDict, Annotated, Mapping
+from datetime import datetime, timedelta
 from enum import Enum
+from types import MappingProxyType
+
+import aiofiles
 
 from models import SpecState, WorkflowPhase, ApprovalStatus, ChatMessage, PhaseResult
 from llm_client import LLMMessage
 
 logger = logging.getLogger(__name__)
 
+# Last generated state timestamp and the monotonic time it was generated at
+_last_ts_mono = float("-inf")
+_last_ts_str = ""
+
+
+def _now_iso() -> str:
+    """Get the current UTC time in ISO format, reused for updates within the same millisecond"""
+    global _last_ts_mono, _last_ts_str
+    
+    t = time.monotonic()
+    if t - _last_ts_mono > 0.001:
+        _last_ts_str = datetime.utcnow().isoformat()
+        _last_ts_mono = t
+    return _last_ts_str
+
 
 class WorkflowStatus(str, Enum):
     """Overall workflow execution status"""
@@ -24,11 +46,52 @@ class WorkflowStatus(str, Enum):
     GENERATING_TASKS = "generating_tasks"
     AWAITING_TASKS_APPROVAL = "awaiting_tasks_approval"
     GENERATING_FINAL_DOCUMENTS = "generating_final_documents"
+    REQUIRES_HARD_RETRY = "requires_hard_retry"  # Node failed after in-node retries, re-run it
     COMPLETED = "completed"
     FAILED = "failed"
     CANCELLED = "cancelled"
 
 
+# Status groups checked on every transition and status poll. The enum stays
+# str-valued because the API, frontend and stored checkpoints use the string
+# values; frozenset membership hashes once instead of comparing each member.
+AWAITING_APPROVAL_STATUSES = frozenset({
+    WorkflowStatus.AWAITING_REQUIREMENTS_APPROVAL,
+    WorkflowStatus.AWAITING_DESIGN_APPROVAL,
+    WorkflowStatus.AWAITING_TASKS_APPROVAL
+})
+TERMINAL_STATUSES = frozenset({
+    WorkflowStatus.COMPLETED,
+    WorkflowStatus.FAILED,
+    WorkflowStatus.CANCELLED
+})
+
+# Phase transitions, keyed by the phase that was pending approval
+_AWAITING_STATUS = {
+    "requirements": WorkflowStatus.AWAITING_REQUIREMENTS_APPROVAL,
+    "design": WorkflowStatus.AWAITING_DESIGN_APPROVAL,
+    "tasks": WorkflowStatus.AWAITING_TASKS_APPROVAL
+}
+# Tasks approval doesn't complete the workflow yet - final documents need to be generated
+_NEXT_ON_APPROVE = {
+    "requirements": (WorkflowStatus.GENERATING_DESIGN, WorkflowPhase.DESIGN),
+    "design": (WorkflowStatus.GENERATING_TASKS, WorkflowPhase.TASKS),
+    "tasks": (WorkflowStatus.GENERATING_FINAL_DOCUMENTS, WorkflowPhase.COMPLETED)
+}
+_REVISION_STATUS = {
+    "requirements": WorkflowStatus.GENERATING_REQUIREMENTS,
+    "design": WorkflowStatus.GENERATING_DESIGN,
+    "tasks": WorkflowStatus.GENERATING_TASKS
+}
+_CONTENT_FIELD = {phase: f"{phase}_content" for phase in _AWAITING_STATUS}
+_APPROVED_FIELD = {phase: f"{phase}_approved" for phase in _AWAITING_STATUS}
+_DOCUMENT_PHASES = (
+    ("requirements", WorkflowPhase.REQUIREMENTS),
+    ("design", WorkflowPhase.DESIGN),
+    ("tasks", WorkflowPhase.TASKS)
+)
+
+
 class WorkflowAction(str, Enum):
     """Actions that can be taken during workflow execution"""
     START_GENERATION = "start_generation"
@@ -39,10 +102,23 @@ class WorkflowAction(str, Enum):
     RETRY = "retry"
 
 
+# Enum values for log messages; a dict lookup is cheaper than the .value descriptor
+_PHASE_NAMES = {phase: phase.value for phase in WorkflowPhase}
+_STATUS_NAMES = {status: status.value for status in WorkflowStatus}
+_ACTION_NAMES = {action: action.value for action in WorkflowAction}
+
+# Shared string objects for values repeated across workflows and messages
+_INTERNED_ROLES = {role: sys.intern(role) for role in ("user", "assistant", "system", "tool")}
+
+
 class WorkflowGraphState(TypedDict):
     """
     State structure for LangGraph workflow execution.
     This represents the complete state that flows through the workflow nodes.
+    
+    Kept as a TypedDict rather than a slotted dataclass: it is the StateGraph
+    schema, LangGraph merges node updates into it as a dict, and nodes, routes
+    and the checkpointer all use key access.
     """
     
     # Core workflow identification
@@ -71,6 +147,7 @@ class WorkflowGraphState(TypedDict):
     
     # LLM context and history
     conversation_history: List[Dict[str, Any]]
+    user_message_count: int  # User messages in conversation_history, lets prompt building skip the scan
     llm_provider: str
     model_name: str
     
@@ -85,18 +162,58 @@ class WorkflowGraphState(TypedDict):
     # Timestamps
     created_at: str
     updated_at: str
+    revision: int  # Bumped on every write, since updated_at can repeat within a millisecond
     
     # Generated files tracking
     generated_files: Dict[str, str]
     written_file_paths: Optional[Dict[str, str]]  # Actual file paths written to disk
 
 
+def _discard_speculative_draft(workflow_id: str) -> None:
+    """Cancel and drop a workflow's speculative next-phase draft, if any"""
+    # Imported here since workflow_nodes imports this module
+    from workflow_nodes import discard_speculative_draft
+    discard_speculative_draft(workflow_id)
+
+
 class WorkflowStateManager:
-    """Manages workflow state transitions and persistence"""
+    """
+    Manages workflow state transitions and persistence.
     
-    def __init__(self):
-        """Initialize the state manager"""
-        self._active_workflows: Dict[str, WorkflowGraphState] = {}
+    Only used from the event loop thread, and no method awaits, so each call
+    runs without interleaving and needs no locks. Code running in worker
+    threads (to_thread, sync iterators) must not call into the manager.
+    """
+    
+    def __init__(
+        self,
+        retain_payloads: bool = False,
+        max_workflows: int = 1024,
+        ttl_seconds: int = 3600,
+        history_cap: int = 200
+    ):
+        """
+        Initialize the state manager.
+        
+        Args:
+            retain_payloads: Keep rendered documents in memory after they are written
+                to disk, instead of reading them back from the files (for debugging)
+            max_workflows: Number of workflows above which finished ones are evicted
+            ttl_seconds: How long a finished workflow is kept after its last update
+            history_cap: Maximum conversation messages kept per workflow, oldest dropped first
+        """
+        self.retain_payloads = retain_payloads
+        self.max_workflows = max_workflows
+        self.ttl_seconds = ttl_seconds
+        self.history_cap = history_cap
+        # Least recently used first
+        self._active_workflows: "OrderedDict[str, WorkflowGraphState]" = OrderedDict()
+        # Partial LLM output for phases being generated: workflow_id -> (phase, chunks)
+        self._streaming_content: Dict[str, Tuple[str, List[str]]] = {}
+        # Last SpecState built per workflow, with the state revision it was built from
+        self._spec_state_cache: Dict[str, Tuple[int, SpecState]] = {}
+        # Converted conversation history per workflow, with the last message converted
+        self._convert_cache: Dict[str, Tuple[Dict[str, Any], List[ChatMessage]]] = {}
         logger.info("Workflow state manager initialized")
     
     def create_workflow_state(
@@ -123,7 +240,12 @@ class WorkflowStateManager:
             Initial workflow state
         """
         
-        now = datetime.utcnow().isoformat()
+        now = _now_iso()
+        
+        # Provider and model names repeat across workflows; share one string each
+        # Either may be None, in which case the LLM client falls back to the settings default
+        llm_provider = sys.intern(llm_provider) if llm_provider else llm_provider
+        model_name = sys.intern(model_name) if model_name else model_name
         
         initial_state: WorkflowGraphState = {
             "workflow_id": workflow_id,
@@ -141,6 +263,7 @@ class WorkflowStateManager:
             "user_feedback": None,
             "last_user_action": None,
             "conversation_history": [],
+            "user_message_count": 0,
             "llm_provider": llm_provider,
             "model_name": model_name,
             "research_enabled": research_enabled,
@@ -149,18 +272,53 @@ class WorkflowStateManager:
             "last_error": None,
             "created_at": now,
             "updated_at": now,
-            "generated_files": {}
+            "revision": 0,
+            "generated_files": {},
+            "written_file_paths": None
         }
         
         # Store in memory (in production, this would be persisted to database)
         self._active_workflows[workflow_id] = initial_state
+        self._evict()
         
-        logger.info(f"Created workflow state for {feature_name} (ID: {workflow_id})")
+        logger.info("Created workflow state for %s (ID: %s)", feature_name, workflow_id)
         return initial_state
     
+    def restore_workflow_state(self, checkpoint_values: Dict[str, Any]) -> WorkflowGraphState:
+        """
+        Put a workflow back into memory from its checkpointed graph state.
+        
+        Used when a persistent checkpointer still has a workflow this process
+        doesn't, after a restart or an eviction.
+        
+        Args:
+            checkpoint_values: Graph state values of the workflow's latest checkpoint
+            
+        Returns:
+            Restored workflow state
+        """
+        
+        # Start from a fresh state so fields the checkpoint predates get their defaults
+        state = self.create_workflow_state(
+            checkpoint_values["workflow_id"],
+            checkpoint_values["feature_name"],
+            checkpoint_values["initial_description"]
+        )
+        # Copied so appends to the restored history can't reach the checkpointer's objects
+        state.update((key, deepcopy(value)) for key, value in checkpoint_values.items() if key in state)
+        
+        if "user_message_count" not in checkpoint_values:
+            state["user_message_count"] = sum(1 for msg in state["conversation_history"] if msg["role"] == "user")
+        
+        logger.info("Restored workflow %s from its checkpoint", state["workflow_id"])
+        return state
+    
     def get_workflow_state(self, workflow_id: str) -> Optional[WorkflowGraphState]:
         """Get workflow state by ID"""
-        return self._active_workflows.get(workflow_id)
+        state = self._active_workflows.get(workflow_id)
+        if state is not None:
+            self._active_workflows.move_to_end(workflow_id)
+        return state
     
     def update_workflow_state(
         self,
@@ -170,6 +328,12 @@ class WorkflowStateManager:
         """
         Update workflow state with new values.
         
+        This is the single write path for field updates and stamps the state
+        once per call, so related field changes go in one updates dict. The
+        dict is the delta to persist if this state ever gets its own store;
+        today durability comes from the LangGraph checkpointer, which only
+        writes the channels that changed.
+        
         Args:
             workflow_id: Workflow identifier
             updates: Dictionary of field updates
@@ -181,20 +345,15 @@ class WorkflowStateManager:
             ValueError: If workflow not found
         """
         
-        if workflow_id not in self._active_workflows:
+        state = self._active_workflows.get(workflow_id)
+        if state is None:
             raise ValueError(f"Workflow {workflow_id} not found")
         
-        state = self._active_workflows[workflow_id]
+        # Only known fields are written
+        state.update((key, value) for key, value in updates.items() if key in state)
+        self._touch(state)
         
-        # Update fields
-        for key, value in updates.items():
-            if key in state:
-                state[key] = value
-        
-        # Update timestamp
-        state["updated_at"] = datetime.utcnow().isoformat()
-        
-        logger.debug(f"Updated workflow {workflow_id} with {len(updates)} changes")
+        logger.debug("Updated workflow %s with %d changes", workflow_id, len(updates))
         return state
     
     def transition_to_phase(
@@ -227,14 +386,15 @@ class WorkflowStateManager:
         
         state = self.update_workflow_state(workflow_id, updates)
         
-        logger.info(f"Transitioned workflow {workflow_id} to {phase.value} ({status.value})")
+        logger.info("Transitioned workflow %s to %s (%s)", workflow_id, _PHASE_NAMES[phase], _STATUS_NAMES[status])
         return state
     
     def set_pending_approval(
         self,
         workflow_id: str,
         phase: str,
-        content: str
+        content: str,
+        message_metadata: Optional[Dict[str, Any]] = None
     ) -> WorkflowGraphState:
         """
         Set workflow to awaiting approval state.
@@ -243,29 +403,29 @@ class WorkflowStateManager:
             workflow_id: Workflow identifier
             phase: Phase awaiting approval
             content: Generated content for approval
+            message_metadata: If given, the content is also recorded as an assistant
+                message with this metadata (JSON primitives only), in the same state update
             
         Returns:
             Updated workflow state
         """
         
-        # Determine the appropriate status and content field
-        status_map = {
-            "requirements": WorkflowStatus.AWAITING_REQUIREMENTS_APPROVAL,
-            "design": WorkflowStatus.AWAITING_DESIGN_APPROVAL,
-            "tasks": WorkflowStatus.AWAITING_TASKS_APPROVAL
-        }
-        
-        content_field = f"{phase}_content"
-        
         updates = {
-            "status": status_map[phase],
+            "status": _AWAITING_STATUS[phase],
             "pending_approval": phase,
-            content_field: content
+            _CONTENT_FIELD[phase]: content
         }
         
+        if message_metadata is not None:
+            state = self.get_workflow_state(workflow_id)
+            if not state:
+                raise ValueError(f"Workflow {workflow_id} not found")
+            
+            self._append_message(state, self._build_message("assistant", content, message_metadata))
+        
         state = self.update_workflow_state(workflow_id, updates)
         
-        logger.info(f"Workflow {workflow_id} awaiting approval for {phase}")
+        logger.info("Workflow %s awaiting approval for %s", workflow_id, phase)
         return state
     
     def handle_user_approval(
@@ -301,38 +461,24 @@ class WorkflowStateManager:
         }
         
         if action == WorkflowAction.APPROVE:
-            # Mark phase as approved
-            approval_field = f"{pending_phase}_approved"
-            updates[approval_field] = True
-            
-            # Determine next phase or completion
-            if pending_phase == "requirements":
-                updates["status"] = WorkflowStatus.GENERATING_DESIGN
-                updates["current_phase"] = WorkflowPhase.DESIGN
-            elif pending_phase == "design":
-                updates["status"] = WorkflowStatus.GENERATING_TASKS
-                updates["current_phase"] = WorkflowPhase.TASKS
-            elif pending_phase == "tasks":
-                # Don't mark as completed yet - final documents need to be generated
-                updates["status"] = WorkflowStatus.GENERATING_FINAL_DOCUMENTS
-                updates["current_phase"] = WorkflowPhase.COMPLETED
+            # Mark phase as approved and move on to the next phase or completion
+            updates[_APPROVED_FIELD[pending_phase]] = True
+            updates["status"], updates["current_phase"] = _NEXT_ON_APPROVE[pending_phase]
             
         elif action == WorkflowAction.REQUEST_REVISION:
-            # Reset to generation phase with feedback
-            if pending_phase == "requirements":
-                updates["status"] = WorkflowStatus.GENERATING_REQUIREMENTS
-            elif pending_phase == "design":
-                updates["status"] = WorkflowStatus.GENERATING_DESIGN
-            elif pending_phase == "tasks":
-                updates["status"] = WorkflowStatus.GENERATING_TASKS
+            # Reset to generation phase with feedback; a draft of the next
+            # phase was built from the content being revised
+            updates["status"] = _REVISION_STATUS[pending_phase]
+            _discard_speculative_draft(workflow_id)
         
         elif action == WorkflowAction.REJECT:
             # For now, treat rejection as cancellation
             updates["status"] = WorkflowStatus.CANCELLED
+            _discard_speculative_draft(workflow_id)
         
         state = self.update_workflow_state(workflow_id, updates)
         
-        logger.info(f"Handled user {action.value} for {pending_phase} in workflow {workflow_id}")
+        logger.info("Handled user %s for %s in workflow %s", _ACTION_NAMES[action], pending_phase, workflow_id)
         return state
     
     def add_conversation_message(
@@ -359,22 +505,113 @@ class WorkflowStateManager:
         if not state:
             raise ValueError(f"Workflow {workflow_id} not found")
         
-        message = {
-            "role": role,
+        message = self._build_message(role, content, metadata)
+        
+        self._append_message(state, message)
+        self._touch(state)
+        
+        logger.debug("Added %s message to workflow %s", role, workflow_id)
+        return state
+    
+    def _append_message(self, state: WorkflowGraphState, message: Dict[str, Any]) -> None:
+        """Append a message to the conversation history, dropping the oldest beyond the cap"""
+        
+        # Append in place; copying the history made every new message O(n)
+        history = state["conversation_history"]
+        history.append(message)
+        has_user_count = "user_message_count" in state
+        if message["role"] == "user" and has_user_count:
+            state["user_message_count"] += 1
+        
+        # Prompts only use the most recent messages
+        excess = len(history) - self.history_cap
+        if excess > 0:
+            if has_user_count:
+                state["user_message_count"] -= sum(1 for msg in history[:excess] if msg["role"] == "user")
+            del history[:excess]
+    
+    @staticmethod
+    def _touch(state: WorkflowGraphState) -> None:
+        """Stamp a state as changed"""
+        state["updated_at"] = _now_iso()
+        state["revision"] = state.get("revision", 0) + 1
+    
+    @staticmethod
+    def _build_message(role: str, content: str, metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build a conversation history entry; metadata values must be JSON primitives (no enums)"""
+        return {
+            "role": _INTERNED_ROLES.get(role) or sys.intern(role),
             "content": content,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _now_iso(),
             "metadata": metadata or {}
         }
+    
+    async def get_generated_files(self, workflow_id: str) -> Mapping[str, str]:
+        """
+        Get the rendered documents of a workflow.
         
-        conversation_history = state["conversation_history"].copy()
-        conversation_history.append(message)
+        Documents shed from memory after being written are read back from disk.
         
-        state = self.update_workflow_state(workflow_id, {
-            "conversation_history": conversation_history
-        })
+        Args:
+            workflow_id: Workflow identifier
+            
+        Returns:
+            Read-only view of filename -> content, shared with the workflow state
+        """
         
-        logger.debug(f"Added {role} message to workflow {workflow_id}")
-        return state
+        state = self.get_workflow_state(workflow_id)
+        if not state:
+            raise ValueError(f"Workflow {workflow_id} not found")
+        
+        if state["generated_files"]:
+            return MappingProxyType(state["generated_files"])
+        
+        generated_files = {}
+        for filename, path in (state.get("written_file_paths") or {}).items():
+            try:
+                async with aiofiles.open(path, "r", encoding="utf-8") as f:
+                    generated_files[filename] = await f.read()
+            except OSError as e:
+                logger.warning("Could not read %s for workflow %s from %s: %s", filename, workflow_id, path, e)
+        
+        return MappingProxyType(generated_files)
+    
+    def append_streaming_chunk(self, workflow_id: str, phase: str, chunk: str) -> None:
+        """
+        Record a chunk of phase content as the LLM streams it.
+        
+        Args:
+            workflow_id: Workflow identifier
+            phase: Phase being generated (requirements, design, tasks)
+            chunk: Newly generated text
+        """
+        
+        streaming = self._streaming_content.get(workflow_id)
+        if streaming is None or streaming[0] != phase:
+            streaming = (phase, [])
+            self._streaming_content[workflow_id] = streaming
+        streaming[1].append(chunk)
+    
+    def get_streaming_content(self, workflow_id: str, phase: Optional[str] = None) -> Optional[str]:
+        """
+        Get the partial content of a phase that is still being generated.
+        
+        Args:
+            workflow_id: Workflow identifier
+            phase: Only return content for this phase if given
+            
+        Returns:
+            Text generated so far, or None if nothing is streaming
+        """
+        
+        streaming = self._streaming_content.get(workflow_id)
+        if streaming is None or (phase is not None and streaming[0] != phase):
+            return None
+        return "".join(streaming[1])
+    
+    def clear_streaming_content(self, workflow_id: str) -> None:
+        """Drop partial content once a generation finishes or fails"""
+        self._streaming_content.pop(workflow_id, None)
     
     def convert_to_spec_state(self, workflow_state: WorkflowGraphState) -> SpecState:
         """
@@ -384,44 +621,52 @@ class WorkflowStateManager:
             workflow_state: LangGraph workflow state
             
         Returns:
-            SpecState model instance
+            SpecState model instance, shared between callers until the workflow
+            state changes, so it must not be modified
         """
         
-        # Convert conversation history
-        conversation_history = []
-        for msg in workflow_state["conversation_history"]:
+        # revision changes on every state update, so it identifies this version of the state
+        workflow_id = workflow_state["workflow_id"]
+        revision = workflow_state.get("revision")
+        cached = self._spec_state_cache.get(workflow_id)
+        if cached is not None and revision is not None and cached[0] == revision:
+            return cached[1]
+        
+        # Convert conversation history; messages are only appended and dropped
+        # from the front, so only messages added since the last conversion are parsed
+        history = workflow_state["conversation_history"]
+        last_converted, converted = self._convert_cache.get(workflow_id, (None, []))
+        
+        converted_count = 0
+        for index in range(len(history) - 1, -1, -1):
+            if history[index] is last_converted:
+                converted_count = index + 1
+                break
+        converted = converted[len(converted) - converted_count:] if converted_count else []
+        
+        for msg in history[converted_count:]:
             chat_msg = ChatMessage(
                 role=msg["role"],
                 content=msg["content"],
                 timestamp=datetime.fromisoformat(msg["timestamp"]),
                 metadata=msg.get("metadata", {})
             )
-            conversation_history.append(chat_msg)
+            converted.append(chat_msg)
         
-        # Create phase results if content exists
-        requirements = None
-        if workflow_state["requirements_content"]:
-            requirements = PhaseResult(
-                phase=WorkflowPhase.REQUIREMENTS,
-                content=workflow_state["requirements_content"],
-                approval_status=ApprovalStatus.APPROVED if workflow_state["requirements_approved"] else ApprovalStatus.PENDING
-            )
+        if history:
+            self._convert_cache[workflow_id] = (history[-1], converted)
+        conversation_history = list(converted)
         
-        design = None
-        if workflow_state["design_content"]:
-            design = PhaseResult(
-                phase=WorkflowPhase.DESIGN,
-                content=workflow_state["design_content"],
-                approval_status=ApprovalStatus.APPROVED if workflow_state["design_approved"] else ApprovalStatus.PENDING
-            )
-        
-        tasks = None
-        if workflow_state["tasks_content"]:
-            tasks = PhaseResult(
-                phase=WorkflowPhase.TASKS,
-                content=workflow_state["tasks_content"],
-                approval_status=ApprovalStatus.APPROVED if workflow_state["tasks_approved"] else ApprovalStatus.PENDING
-            )
+        # Create phase results if content exists
+        phase_results = {}
+        for name, phase in _DOCUMENT_PHASES:
+            content = workflow_state[_CONTENT_FIELD[name]]
+            if content:
+                phase_results[name] = PhaseResult(
+                    phase=phase,
+                    content=content,
+                    approval_status=ApprovalStatus.APPROVED if workflow_state[_APPROVED_FIELD[name]] else ApprovalStatus.PENDING
+                )
         
         # Create SpecState
         spec_state = SpecState(
@@ -429,24 +674,49 @@ class WorkflowStateManager:
             feature_name=workflow_state["feature_name"],
             initial_description=workflow_state["initial_description"],
             current_phase=workflow_state["current_phase"],
-            is_active=workflow_state["status"] not in [WorkflowStatus.COMPLETED, WorkflowStatus.FAILED, WorkflowStatus.CANCELLED],
+            is_active=workflow_state["status"] not in TERMINAL_STATUSES,
             created_at=datetime.fromisoformat(workflow_state["created_at"]),
             updated_at=datetime.fromisoformat(workflow_state["updated_at"]),
-            requirements=requirements,
-            design=design,
-            tasks=tasks,
+            requirements=phase_results.get("requirements"),
+            design=phase_results.get("design"),
+            tasks=phase_results.get("tasks"),
             conversation_history=conversation_history,
             llm_provider=workflow_state["llm_provider"],
             model_name=workflow_state["model_name"],
             enable_research=workflow_state["research_enabled"]
         )
         
+        if revision is not None:
+            self._spec_state_cache[workflow_id] = (revision, spec_state)
         return spec_state
     
     def list_active_workflows(self) -> List[str]:
         """Get list of active workflow IDs"""
         return list(self._active_workflows.keys())
     
+    def _evict(self) -> None:
+        """Evict least recently used finished workflows past their TTL while over capacity"""
+        excess = len(self._active_workflows) - self.max_workflows
+        if excess <= 0:
+            return
+        
+        cutoff = datetime.utcnow() - timedelta(seconds=self.ttl_seconds)
+        expired = []
+        
+        for workflow_id, state in self._active_workflows.items():
+            if len(expired) == excess:
+                break
+            # Workflows still in progress are never evicted
+            if state["status"] in TERMINAL_STATUSES and datetime.fromisoformat(state["updated_at"]) < cutoff:
+                expired.append(workflow_id)
+        
+        # cleanup_workflow also drops each workflow's caches and speculative draft
+        for workflow_id in expired:
+            self.cleanup_workflow(workflow_id)
+        
+        if expired:
+            logger.info("Evicted %d finished workflows from memory", len(expired))
+    
     def cleanup_workflow(self, workflow_id: str) -> bool:
         """
         Remove workflow from active state.
@@ -458,9 +728,14 @@ class WorkflowStateManager:
             True if workflow was removed, False if not found
         """
         
+        _discard_speculative_draft(workflow_id)
+        self._streaming_content.pop(workflow_id, None)
+        self._spec_state_cache.pop(workflow_id, None)
+        self._convert_cache.pop(workflow_id, None)
+        
         if workflow_id in self._active_workflows:
             del self._active_workflows[workflow_id]
-            logger.info(f"Cleaned up workflow {workflow_id}")
+            logger.info("Cleaned up workflow %s", workflow_id)
             return True
         
         return False
@@ -6,14 +6,24 @@ This script starts both the backend (FastAPI) and frontend (React) servers
 Works on Windows, macOS, and Linux
 """
 
-import os
 import sys
+import shutil
 import subprocess
+import threading
+import queue
 import time
 import signal
 import platform
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Project directories, relative to the spec-bot root the script runs from
+BACKEND_DIR = Path("backend")
+FRONTEND_DIR = Path("frontend")
+
+# Stamped after a successful install; newer than the dependency file means nothing to install
+DEPS_MARKER = ".deps_installed"
+
 # Colors for console output
 class Colors:
     RED = '\033[0;31m'
@@ -44,6 +54,12 @@ def print_warning(message):
 def print_error(message):
     print(f"{Colors.RED}[ERROR]{Colors.NC} {message}")
 
+def deps_up_to_date(marker, dependency_file):
+    """Check if an install marker is at least as new as the dependency file"""
+    if not marker.exists():
+        return False
+    return not dependency_file.exists() or marker.stat().st_mtime >= dependency_file.stat().st_mtime
+
 class SpecBotLauncher:
     def __init__(self):
         self.backend_process = None
@@ -82,7 +98,7 @@ class SpecBotLauncher:
     def check_prerequisites(self):
         """Check if required tools are available"""
         # Check if we're in the right directory
-        if not (Path("backend").exists() and Path("frontend").exists()):
+        if not (BACKEND_DIR.exists() and FRONTEND_DIR.exists()):
             print_error("Please run this script from the spec-bot root directory")
             print_error("Expected directories: ./backend and ./frontend")
             return False
@@ -113,61 +129,80 @@ class SpecBotLauncher:
         """Set up backend environment"""
         print_status("Setting up backend environment...")
         
-        os.chdir("backend")
-        
         # Check if virtual environment exists
-        venv_path = Path("venv")
+        venv_path = BACKEND_DIR / "venv"
         if not venv_path.exists():
             print_warning("Virtual environment not found. Creating one...")
-            subprocess.run([sys.executable, "-m", "venv", "venv"], check=True)
+            subprocess.run([sys.executable, "-m", "venv", "venv"], cwd=BACKEND_DIR, check=True)
             print_success("Virtual environment created")
         
-        # Get the correct python executable for the venv
+        # Get the correct python executable for the venv. Made absolute rather
+        # than resolved, since resolving follows the venv symlink to the base python
         if self.is_windows:
-            venv_python = Path("venv/Scripts/python.exe")
-            venv_pip = Path("venv/Scripts/pip.exe")
+            venv_python = (venv_path / "Scripts" / "python.exe").absolute()
+            venv_pip = (venv_path / "Scripts" / "pip.exe").absolute()
         else:
-            venv_python = Path("venv/bin/python")
-            venv_pip = Path("venv/bin/pip")
+            venv_python = (venv_path / "bin" / "python").absolute()
+            venv_pip = (venv_path / "bin" / "pip").absolute()
         
         # Check if requirements are installed
         print_status("Checking backend dependencies...")
-        try:
-            result = subprocess.run([str(venv_python), "-c", "import fastapi"], 
-                                  capture_output=True)
-            if result.returncode != 0:
-                raise subprocess.CalledProcessError(result.returncode, "import check")
-        except subprocess.CalledProcessError:
-            print_warning("Installing backend dependencies...")
-            subprocess.run([str(venv_pip), "install", "-r", "requirements.txt"], check=True)
-            print_success("Backend dependencies installed")
+        deps_marker = venv_path / DEPS_MARKER
+        if not deps_up_to_date(deps_marker, BACKEND_DIR / "requirements.txt"):
+            # Without a marker, probe for an install made before markers existed;
+            # a stale marker means requirements.txt changed since the last install
+            installed = False
+            if not deps_marker.exists():
+                result = subprocess.run([str(venv_python), "-c", "import fastapi"], 
+                                      capture_output=True)
+                installed = result.returncode == 0
+            
+            if not installed:
+                print_warning("Installing backend dependencies...")
+                subprocess.run([str(venv_pip), "install", "-r", "requirements.txt"], cwd=BACKEND_DIR, check=True)
+                print_success("Backend dependencies installed")
+            
+            deps_marker.touch()
         
         # Check if .env exists
-        if not Path(".env").exists():
-            if Path("../.env.template").exists():
+        if not (BACKEND_DIR / ".env").exists():
+            if Path(".env.template").exists():
                 print_warning("No .env file found. Creating from template...")
-                import shutil
-                shutil.copy("../.env.template", ".env")
+                # A copy, not a link: the .env gets API keys and the template is tracked
+                shutil.copyfile(".env.template", BACKEND_DIR / ".env")
                 print_warning("Please edit .env file and add your OpenAI API key")
             else:
                 print_warning("No .env file found. Please create one with your API keys")
         
-        os.chdir("..")
         return str(venv_python)
 
     def setup_frontend(self):
         """Set up frontend environment"""
         print_status("Setting up frontend environment...")
         
-        os.chdir("frontend")
-        
-        # Check if node_modules exists
-        if not Path("node_modules").exists():
+        # Check if node_modules exists and matches package-lock.json
+        node_modules = FRONTEND_DIR / "node_modules"
+        deps_marker = node_modules / DEPS_MARKER
+        if not node_modules.exists():
             print_warning("Node modules not found. Installing...")
-            subprocess.run(["npm", "install"], check=True)
-            print_success("Frontend dependencies installed")
+        elif deps_marker.exists() and not deps_up_to_date(deps_marker, FRONTEND_DIR / "package-lock.json"):
+            print_warning("Frontend dependencies changed. Installing...")
+        else:
+            if not deps_marker.exists():
+                deps_marker.touch()
+            return
         
-        os.chdir("..")
+        subprocess.run(["npm", "install"], cwd=FRONTEND_DIR, check=True)
+        deps_marker.touch()
+        print_success("Frontend dependencies installed")
+
+    def console_flags(self):
+        """Get Windows creation flags for the server processes"""
+        # Interactive runs get a console window per server; headless runs (CI)
+        # skip the console allocation and log to the inherited output instead
+        if sys.stdout.isatty():
+            return subprocess.CREATE_NEW_CONSOLE
+        return subprocess.CREATE_NO_WINDOW
 
     def start_servers(self, venv_python):
         """Start both servers"""
@@ -176,40 +211,56 @@ class SpecBotLauncher:
         
         # Start backend
         print_status("Starting backend server...")
-        os.chdir("backend")
         
         if self.is_windows:
             # On Windows, start in a new console window
             self.backend_process = subprocess.Popen(
                 [venv_python, "main.py"],
-                creationflags=subprocess.CREATE_NEW_CONSOLE
+                cwd=BACKEND_DIR,
+                creationflags=self.console_flags()
             )
         else:
-            self.backend_process = subprocess.Popen([venv_python, "main.py"])
-        
-        os.chdir("..")
+            self.backend_process = subprocess.Popen([venv_python, "main.py"], cwd=BACKEND_DIR)
         
         # Wait for backend to start
         time.sleep(3)
         
         # Start frontend
         print_status("Starting frontend server...")
-        os.chdir("frontend")
         
         if self.is_windows:
             # On Windows, start in a new console window
             self.frontend_process = subprocess.Popen(
                 ["npm", "run", "dev"],
-                creationflags=subprocess.CREATE_NEW_CONSOLE
+                cwd=FRONTEND_DIR,
+                creationflags=self.console_flags()
             )
         else:
-            self.frontend_process = subprocess.Popen(["npm", "run", "dev"])
-        
-        os.chdir("..")
+            self.frontend_process = subprocess.Popen(["npm", "run", "dev"], cwd=FRONTEND_DIR)
         
         # Wait for frontend to start
         time.sleep(5)
 
+    def wait_for_exit(self):
+        """Block until either server process exits and return its name"""
+        exited = queue.Queue()
+        
+        for name, process in (("Backend", self.backend_process), ("Frontend", self.frontend_process)):
+            if process:
+                threading.Thread(
+                    target=lambda name=name, process=process: exited.put((name, process.wait())),
+                    daemon=True
+                ).start()
+        
+        # Windows only handles Ctrl+C in the main thread between waits, so wake up there periodically
+        timeout = 1 if self.is_windows else None
+        while True:
+            try:
+                name, _ = exited.get(timeout=timeout)
+                return name
+            except queue.Empty:
+                continue
+
     def run(self):
         """Main run method"""
         # Set up signal handlers
@@ -224,9 +275,12 @@ class SpecBotLauncher:
             return 1
         
         try:
-            # Set up environments
-            venv_python = self.setup_backend()
-            self.setup_frontend()
+            # Set up environments; pip and npm installs run concurrently
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                backend_setup = executor.submit(self.setup_backend)
+                frontend_setup = executor.submit(self.setup_frontend)
+                venv_python = backend_setup.result()
+                frontend_setup.result()
             
             # Start servers
             self.start_servers(venv_python)
@@ -240,7 +294,7 @@ class SpecBotLauncher:
             print(f"{Colors.BLUE}📚 API Docs:{Colors.NC} http://localhost:8000/docs")
             print("")
             
-            if self.is_windows:
+            if self.is_windows and sys.stdout.isatty():
                 print_status("Both servers are running in separate console windows")
                 print_status("Close those windows or press Ctrl+C here to stop")
             else:
@@ -248,17 +302,10 @@ class SpecBotLauncher:
             
             print("")
             
-            # Keep script running
+            # Keep script running until a server exits
             try:
-                while True:
-                    time.sleep(1)
-                    # Check if processes are still running
-                    if self.backend_process and self.backend_process.poll() is not None:
-                        print_error("Backend process stopped unexpectedly")
-                        break
-                    if self.frontend_process and self.frontend_process.poll() is not None:
-                        print_error("Frontend process stopped unexpectedly")
-                        break
+                stopped = self.wait_for_exit()
+                print_error(f"{stopped} process stopped unexpectedly")
             except KeyboardInterrupt:
                 self.cleanup()
         